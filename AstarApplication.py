@@ -1,11 +1,8 @@
 import sys
 import logging
-import heapq
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtCore import QTimer
-from SettingsMenu import SettingsMenu
-from Visualizer import Visualizer
-from utils import reconstruct_path
+import search
 
 
 class AStarApplication:
@@ -37,6 +34,7 @@ class AStarApplication:
         self.start = None
         self.end = None
         self.heuristic = self.octile_distance
+        self.time_budget = None
         self.settings_applied = False
         self.visualizer = None
         self.settings_dialog = None
@@ -75,7 +73,9 @@ class AStarApplication:
             logging.debug("Out of settings_dialog is not None condition")
 
             logging.debug("Creating Visualizer object")
-            self.visualizer = Visualizer(self.maze, self.start, self.end, self.astar, settings, self.bypass_settings)
+            from Visualizer import Visualizer  # pyqtgraph is only loaded once something is drawn
+            anytime_function = self.anytime_astar if settings.get('search_mode') == 'anytime' else None
+            self.visualizer = Visualizer(self.maze, self.start, self.end, self.astar, settings, self.bypass_settings, anytime_function)
             logging.debug("Visualizer object created")
             self.visualizer.visualization_complete.connect(self.on_visualization_complete)  # Connect signal
             logging.debug("Visualizer signal connected")
@@ -102,6 +102,7 @@ class AStarApplication:
         else:
             logging.debug("No Existing Settings Dialog.")
         logging.debug("Creating new settings dialog")
+        from SettingsMenu import SettingsMenu
         self.settings_dialog = SettingsMenu()
         self.settings_dialog.settings_updated.connect(self.handle_updated_settings)
         self.settings_dialog.menu_closed.connect(self.on_settings_menu_closed)
@@ -122,6 +123,7 @@ class AStarApplication:
         self.start = settings['start_point']
         self.end = settings['end_point']
         self.heuristic = self.euclidean_distance if settings.get('heuristic') == 'euclidean' else self.octile_distance
+        self.time_budget = settings.get('time_budget')
         self.settings_applied = True
         logging.debug("Settings applied.")
         self.start_visualization(settings)
@@ -154,9 +156,7 @@ class AStarApplication:
         Returns:
             float: The octile distance between the points.
         """
-        dx = abs(start[0] - goal[0])
-        dy = abs(start[1] - goal[1])
-        return max(dx, dy) + (1 - 1 / 2) * min(dx, dy)
+        return search.octile_distance(start, goal)
 
     def euclidean_distance(self, start, goal):
         """
@@ -169,66 +169,40 @@ class AStarApplication:
         Returns:
             float: The Euclidean distance between the points.
         """
-        dx = abs(start[0] - goal[0])
-        dy = abs(start[1] - goal[1])
-        return (dx**2 + dy**2)**0.5
+        return search.euclidean_distance(start, goal)
 
-    def process_neighbor(self, matrix, current, neighbor, goal, open_set, came_from, g_score, f_score, rows, cols):
+    def astar(self, matrix, start, goal, neighbor_masks=None):
         """
-        Processes a neighboring cell in the A* algorithm.
+        Implements the A* algorithm.
         
         Args:
             matrix (list): The maze matrix.
-            current (tuple): The current cell.
-            neighbor (tuple): The neighboring cell.
+            start (tuple): The start cell.
             goal (tuple): The goal cell.
-            open_set (list): The open set (priority queue).
-            came_from (dict): Dictionary of where each node came from.
-            g_score (dict): Dictionary of g scores.
-            f_score (dict): Dictionary of f scores.
-            rows (int): Number of rows in the maze.
-            cols (int): Number of columns in the maze.
-        """
-        if 0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols and matrix[neighbor[0]][neighbor[1]] == 0:
-            tentative_g_score = g_score[current] + self.heuristic(current, neighbor)
-            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
-                came_from[neighbor] = current
-                g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + self.octile_distance(neighbor, goal)
-                heapq.heappush(open_set, (f_score[neighbor], neighbor))
-
-    def astar(self, matrix, start, goal):
+            neighbor_masks (NeighborMasks): Optional precomputed passable-neighbor masks.
+        
+        Returns:
+            generator: Yields a SearchEvent per expanded cell, then a final event with the path.
         """
-        Implements the A* algorithm.
+        return search.astar(matrix, start, goal, cost=self.heuristic, heuristic=search.octile_distance,
+                            neighbor_masks=neighbor_masks)
+
+    def anytime_astar(self, matrix, start, goal, neighbor_masks=None):
+        """
+        Runs the anytime (ARA*) search with the application's heuristic and time budget.
         
         Args:
             matrix (list): The maze matrix.
             start (tuple): The start cell.
             goal (tuple): The goal cell.
+            neighbor_masks (NeighborMasks): Optional precomputed passable-neighbor masks.
         
-        Yields:
-            tuple: Current cell, open set, and came_from dictionary.
+        Returns:
+            generator: Yields an AnytimeSolution for each improved path.
         """
-        rows = len(matrix)
-        cols = len(matrix[0])
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1)]
-        open_set = [(0, start)]
-        came_from = {}
-        g_score = {start: 0}
-        f_score = {start: self.octile_distance(start, goal)}
-
-        while open_set:
-            current = heapq.heappop(open_set)[1]
-            yield current, open_set, came_from
-
-            if current == goal:
-                return reconstruct_path(came_from, current, start)
-
-            for dx, dy in directions:
-                neighbor = current[0] + dx, current[1] + dy
-                self.process_neighbor(matrix, current, neighbor, goal, open_set, came_from, g_score, f_score, rows, cols)
-
-        yield None, None, None
+        return search.anytime_astar(matrix, start, goal, cost=self.heuristic, heuristic=search.octile_distance,
+                                    initial_weight=search.DEFAULT_INITIAL_WEIGHT, time_budget=self.time_budget,
+                                    neighbor_masks=neighbor_masks)
 
     def apply_predefined_settings(self, settings):
         """
@@ -13,13 +13,16 @@ DEFAULT_WINDOW_HEIGHT = 600
 DEFAULT_MAZE_SIZE = 10
 DEFAULT_OBSTACLE_DENSITY = 0.3
 DEFAULT_HEURISTIC = 'octile'
+DEFAULT_SEARCH_MODE = 'astar'
+DEFAULT_TIME_BUDGET = 1.0
 DEFAULT_COLORS = {
     'start_node_color': '#00FF00',
     'end_node_color': '#FFD700',
     'path_color': '#0000FF',
     'obstacle_color': '#000000',
     'background_color': '#FFFFFF',
-    'expanded_node_color': '#808080'
+    'expanded_node_color': '#808080',
+    'frontier_node_color': '#87CEEB'
 }
 DARK_MODE_COLORS = {
     'start_node_color': '#00FF00',
@@ -27,7 +30,8 @@ DARK_MODE_COLORS = {
     'path_color': '#0000FF',
     'obstacle_color': '#000000',
     'background_color': '#1E1E1E',
-    'expanded_node_color': '#808080'
+    'expanded_node_color': '#808080',
+    'frontier_node_color': '#87CEEB'
 }
 
 
@@ -55,6 +59,7 @@ class SettingsMenu(QDialog):
         self.setupDarkModeConfig()
         self.setupColorConfig()
         self.setupHeuristicConfig()
+        self.setupSearchModeConfig()
         self.setupMazeConfig()
         self.setupRandomMazeConfig()
         self.setupButtons()
@@ -283,6 +288,22 @@ class SettingsMenu(QDialog):
         self.heuristicLayout.addWidget(self.heuristicComboBox)
         self.layout.addLayout(self.heuristicLayout)
 
+    def setupSearchModeConfig(self):
+        logging.debug("Setting up search mode config")
+        self.searchModeLayout = QHBoxLayout()
+        self.searchModeLabel = QLabel("Search Mode:")
+        self.searchModeComboBox = QComboBox()
+        self.searchModeComboBox.addItem("A*", "astar")
+        self.searchModeComboBox.addItem("Anytime (ARA*)", "anytime")
+        self.timeBudgetLabel = QLabel("Time Budget (s):")
+        self.timeBudgetLineEdit = QLineEdit(str(DEFAULT_TIME_BUDGET))
+        self.timeBudgetLineEdit.setToolTip("Seconds the anytime search may spend improving the path")
+        self.searchModeLayout.addWidget(self.searchModeLabel)
+        self.searchModeLayout.addWidget(self.searchModeComboBox)
+        self.searchModeLayout.addWidget(self.timeBudgetLabel)
+        self.searchModeLayout.addWidget(self.timeBudgetLineEdit)
+        self.layout.addLayout(self.searchModeLayout)
+
     def validateInputs(self):
         logging.debug("Validating inputs")
         valid = True
@@ -296,6 +317,8 @@ class SettingsMenu(QDialog):
         start_point, end_point = self.validateStartEndPoints(maze_size)
         if start_point is None or end_point is None:
             valid = False
+        if self.searchModeComboBox.currentData() == 'anytime' and self.validateTimeBudget() is None:
+            valid = False
         return valid
 
     def validateMazeSize(self):
@@ -318,6 +341,16 @@ class SettingsMenu(QDialog):
             QMessageBox.critical(self, "Input Error", f"Obstacle Density Error: {e}")
             return None
 
+    def validateTimeBudget(self):
+        try:
+            time_budget = float(self.timeBudgetLineEdit.text())
+            if time_budget <= 0:
+                raise ValueError("Time budget must be a positive number of seconds.")
+            return time_budget
+        except ValueError as e:
+            QMessageBox.critical(self, "Input Error", f"Time Budget Error: {e}")
+            return None
+
     def validateStartEndPoints(self, maze_size):
         try:
             start_point = tuple(map(int, self.startPointLineEdit.text().split(',')))
@@ -343,12 +376,15 @@ class SettingsMenu(QDialog):
             'end_point': (DEFAULT_MAZE_SIZE - 1, DEFAULT_MAZE_SIZE - 1),
             'obstacle_density': DEFAULT_OBSTACLE_DENSITY,
             'heuristic': DEFAULT_HEURISTIC,
+            'search_mode': DEFAULT_SEARCH_MODE,
+            'time_budget': DEFAULT_TIME_BUDGET,
             'start_node_color': DARK_MODE_COLORS['start_node_color'],
             'end_node_color': DARK_MODE_COLORS['end_node_color'],
             'path_color': DARK_MODE_COLORS['path_color'],
             'obstacle_color': DARK_MODE_COLORS['obstacle_color'],
             'background_color': DARK_MODE_COLORS['background_color'],
             'expanded_node_color': DARK_MODE_COLORS['expanded_node_color'],
+            'frontier_node_color': DARK_MODE_COLORS['frontier_node_color'],
             'maze': generate_maze(DEFAULT_MAZE_SIZE, DEFAULT_OBSTACLE_DENSITY),
         }
         self.settings_updated.emit(default_settings)
@@ -374,16 +410,20 @@ class SettingsMenu(QDialog):
             'start_point': start_point,
             'end_point': end_point,
             'heuristic': self.heuristicComboBox.currentData(),
+            'search_mode': self.searchModeComboBox.currentData(),
             'start_node_color': self.colorSettings['start_node_color'],
             'end_node_color': self.colorSettings['end_node_color'],
             'path_color': self.colorSettings['path_color'],
             'obstacle_color': self.colorSettings['obstacle_color'],
             'background_color': self.colorSettings['background_color'],
             'expanded_node_color': self.colorSettings['expanded_node_color'],
+            'frontier_node_color': self.colorSettings['frontier_node_color'],
             'maze': self.MazeSetter(),
         }
         if self.randomMazeCheckBox.isChecked():
             obstacle_density = float(self.obstacleDensityLineEdit.text())
             settings.update({'obstacle_density': obstacle_density})
+        if settings['search_mode'] == 'anytime':
+            settings.update({'time_budget': float(self.timeBudgetLineEdit.text())})
         self.settings_updated.emit(settings)
         self.accept()
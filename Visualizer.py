@@ -1,13 +1,21 @@
-import numpy as np
 import pyqtgraph as pg
 from PyQt5.QtWidgets import QApplication, QMessageBox
 from PyQt5.QtCore import QTimer, pyqtSignal, QObject
 from PyQt5.QtGui import QColor
-from utils import reconstruct_path
+from maze_image import build_state_image, build_lookup_table, apply_events, CELL_PATH, CELL_START, CELL_GOAL
+from neighbor_mask import NeighborMasks
+from search import STATUS_FOUND, STATUS_UNREACHABLE
 import logging
 import sys
 
 
+def qcolor_to_rgb(color):
+    """
+    Converts any color string Qt understands, including names like 'red', to an RGB triple.
+    """
+    return QColor(color).getRgb()[:3]
+
+
 class Visualizer(QObject):
     """
     Class representing the visualizer for the A* algorithm.
@@ -15,7 +23,7 @@ class Visualizer(QObject):
     """
     visualization_complete = pyqtSignal()  # Signal emitted when visualization is complete
 
-    def __init__(self, maze, start, goal, astar_function, settings, bypass_settings=False):
+    def __init__(self, maze, start, goal, astar_function, settings, bypass_settings=False, anytime_function=None):
         """
         Initializes the visualizer.
         
@@ -26,6 +34,7 @@ class Visualizer(QObject):
             astar_function (function): The A* algorithm function.
             settings (dict): Settings for the visualization.
             bypass_settings (bool): Flag to bypass settings menu.
+            anytime_function (function): Optional anytime search; when given, each improved path is shown.
         """
         logging.debug("Initializing Visualizer")
         super().__init__()  # Initialize QObject
@@ -33,6 +42,7 @@ class Visualizer(QObject):
         self.start = start
         self.goal = goal
         self.astar_function = astar_function
+        self.anytime_function = anytime_function
         self.settings = settings
         self.bypass_settings = bypass_settings  # Store the bypass_settings flag
         self.win = pg.GraphicsLayoutWidget(show=True, title="A* Visualization")
@@ -41,7 +51,11 @@ class Visualizer(QObject):
         self.view = self.win.addViewBox()
         self.view.setAspectLocked(True)
         self.view.enableAutoRange(True)
-        self.color_maze = None
+        self.state_maze = None
+        self.lut = None
+        self.img_item = None
+        self.path_items = []
+        self.neighbor_masks = NeighborMasks(maze)
         logging.debug("Visualizer initialization complete")
 
 
@@ -70,13 +84,7 @@ class Visualizer(QObject):
         Returns:
             bool: True if the node is surrounded by obstacles, False otherwise.
         """
-        rows, cols = len(self.maze), len(self.maze[0])
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1)]
-        for dx, dy in directions:
-            nx, ny = node[0] + dx, node[1] + dy
-            if 0 <= nx < rows and 0 <= ny < cols and self.maze[nx][ny] == 0:
-                return False
-        return True
+        return self.neighbor_masks.is_surrounded(node)
 
     def visualize(self):
         """
@@ -92,12 +100,16 @@ class Visualizer(QObject):
                 self.handle_invalid_nodes()
                 return
 
-            self.prepare_color_maze()
-            img_item = pg.ImageItem(image=self.color_maze)
+            self.prepare_state_maze()
+            img_item = pg.ImageItem(image=self.state_maze, lut=self.lut, levels=(0, len(self.lut)))
+            self.img_item = img_item
             self.view.addItem(img_item)
             logging.debug("Image item added to view")
 
-            self.astar_visualized(img_item)
+            if self.anytime_function is not None:
+                self.anytime_visualized(img_item)
+            else:
+                self.astar_visualized(img_item)
             logging.debug("A* visualization completed")
 
         except Exception as e:
@@ -120,83 +132,164 @@ class Visualizer(QObject):
             logging.debug("End node is surrounded by obstacles.")
             self.show_reopen_settings_dialog("End node is surrounded by obstacles.")
 
-    def prepare_color_maze(self):
+    def prepare_state_maze(self):
         """
-        Prepares the color representation of the maze for visualization.
+        Prepares the indexed representation of the maze for visualization.
+        Each cell holds a one-byte state that is colored through the lookup table.
         """
-        self.convert_colors()
-        self.color_maze = np.array([self.obstacle_color if cell == 1 else self.background_color for row in self.maze for cell in row], dtype=np.ubyte).reshape((len(self.maze[0]), len(self.maze), 3)).transpose((1, 0, 2))
+        self.set_colors(self.settings)
+        self.state_maze = build_state_image(self.maze)
 
-    def convert_colors(self):
+    def set_colors(self, settings):
         """
-        Converts color settings to RGB values.
+        Applies new color settings by swapping the lookup table; the state image is unchanged.
+        
+        Args:
+            settings (dict): Settings containing the color keys.
         """
-        self.start_color = QColor(self.settings['start_node_color']).getRgb()[:3]
-        self.end_color = QColor(self.settings['end_node_color']).getRgb()[:3]
-        self.path_color = QColor(self.settings['path_color']).getRgb()[:3]
-        self.obstacle_color = QColor(self.settings['obstacle_color']).getRgb()[:3]
-        self.background_color = QColor(self.settings['background_color']).getRgb()[:3]
-        self.expanded_node_color = QColor(self.settings['expanded_node_color']).getRgb()[:3]
+        self.settings = settings
+        self.lut = build_lookup_table(settings, qcolor_to_rgb)
+        if self.img_item is not None:
+            self.img_item.setLookupTable(self.lut)
 
-    def update_cell(self, img_item, cell, color):
+    def update_cell(self, img_item, cell, state):
         """
-        Updates the color of a cell in the maze visualization.
+        Updates the state of a cell in the maze visualization.
         
         Args:
             img_item (pg.ImageItem): The image item representing the maze.
             cell (tuple): The cell to update.
-            color (tuple): The RGB color to set.
+            state (int): One of the maze_image CELL_* states.
+        """
+        self.state_maze[cell[1], cell[0]] = state
+        img_item.setImage(image=self.state_maze, autoLevels=False)
+
+    def update_cells(self, img_item, cells, state):
+        """
+        Sets the state of many cells with a single array assignment.
+        
+        Args:
+            img_item (pg.ImageItem): The image item representing the maze.
+            cells (list): The cells to update.
+            state (int): One of the maze_image CELL_* states.
         """
-        self.color_maze[cell[1], cell[0]] = color
-        img_item.setImage(image=self.color_maze)
+        if not cells:
+            return
+        rows, cols = zip(*cells)
+        self.state_maze[list(cols), list(rows)] = state
+        img_item.setImage(image=self.state_maze, autoLevels=False)
 
     def draw_path(self, path):
         """
         Draws the path from start to goal in the visualization.
         
         Args:
-            path (list): The list of cells representing the path.
+            path (CompactPath): The path, iterated once from start to goal.
         """
-        for i in range(len(path) - 1):
-            x = [path[i][0], path[i + 1][0]+0.5]
-            y = [path[i][1], path[i + 1][1]+0.5]
+        cells = iter(path)
+        previous = next(cells, None)
+        for cell in cells:
+            x = [previous[0], cell[0]+0.5]
+            y = [previous[1], cell[1]+0.5]
             line = pg.PlotDataItem(y, x, pen=pg.mkPen('b', width=2))
             self.view.addItem(line)
+            self.path_items.append(line)
             QApplication.processEvents()
+            previous = cell
+
+    def clear_path(self):
+        """
+        Removes the currently drawn path from the visualization.
+        """
+        for line in self.path_items:
+            self.view.removeItem(line)
+        self.path_items = []
+
+    def apply_event(self, img_item, event):
+        """
+        Applies one search delta to the maze image: the closed cell becomes expanded
+        and the newly opened or improved cells join the frontier.
+        
+        Args:
+            img_item (pg.ImageItem): The image item representing the maze.
+            event (SearchEvent): The delta emitted by the search.
+        """
+        apply_events(self.state_maze, [event], (self.start, self.goal))
+        img_item.setImage(image=self.state_maze, autoLevels=False)
 
     def astar_visualized(self, img_item):
         """
-        Visualizes the A* algorithm step by step.
+        Visualizes the A* algorithm step by step from its delta events.
         """
         logging.debug("Starting astar_visualized")
-        self.update_cell(img_item, self.start, self.start_color)
-        self.update_cell(img_item, self.goal, self.end_color)
+        self.update_cell(img_item, self.start, CELL_START)
+        self.update_cell(img_item, self.goal, CELL_GOAL)
+
+        for event in self.astar_function(self.maze, self.start, self.goal, neighbor_masks=self.neighbor_masks):
+            if event.status is None:
+                self.apply_event(img_item, event)
+                QApplication.processEvents()
+                logging.debug(f"Processed node: {event.closed}")
+                continue
 
-        for current, open_set, came_from in self.astar_function(self.maze, self.start, self.goal):
-            if current is None:
+            if event.status != STATUS_FOUND:
                 logging.warning("No path found. Closing application.")
                 QMessageBox.warning(None, "Pathfinding Warning", "No path found. The application will close in 2 seconds.")
                 QTimer.singleShot(1600, QApplication.instance().exit)
                 return
 
-            if current != self.goal:
-                self.update_cell(img_item, current, self.expanded_node_color)
+            path = event.path
+            self.update_cells(img_item, path[1:-1], CELL_PATH)
+            self.draw_path(path)
+            logging.debug(f"Path found: {len(path)} cells")
+            if self.bypass_settings:
+                logging.debug("Bypass settings is True. Quitting application.")
+                self.quit_application()
             else:
-                path = reconstruct_path(came_from, current, self.start)
-                self.draw_path(path)
-                logging.debug(f"Path found: {path}")
-                if self.bypass_settings:
-                    logging.debug("Bypass settings is True. Quitting application.")
-                    self.quit_application()
-                else:
-                    self.wait_for_user_action()
-                return
+                self.wait_for_user_action()
+            return
 
-            if current == self.start:
-                self.update_cell(img_item, self.start, [0, 255, 0])
+    def anytime_visualized(self, img_item):
+        """
+        Visualizes the anytime search, replacing the drawn path each time a better one arrives.
+        """
+        logging.debug("Starting anytime_visualized")
+        self.update_cell(img_item, self.start, CELL_START)
+        self.update_cell(img_item, self.goal, CELL_GOAL)
 
+        solution = None
+        solutions = self.anytime_function(self.maze, self.start, self.goal, neighbor_masks=self.neighbor_masks)
+        while True:
+            try:
+                solution = next(solutions)
+            except StopIteration as stop:
+                status = stop.value
+                break
+            self.clear_path()
+            self.draw_path(solution.path)
+            self.win.setWindowTitle(f"A* Visualization - cost {solution.cost:.2f}, bound {solution.bound:.3f}")
+            logging.debug(f"Improved path: cost={solution.cost}, weight={solution.weight}, bound={solution.bound}, elapsed={solution.elapsed:.4f}s")
             QApplication.processEvents()
-            logging.debug(f"Processed node: {current}")
+        logging.debug(f"Anytime search finished with status {status}")
+
+        if solution is None:
+            if status == STATUS_UNREACHABLE:
+                message = "No path found."
+            else:
+                message = "The time budget ran out before a path was found."
+            logging.warning(f"{message} Closing application.")
+            QMessageBox.warning(None, "Pathfinding Warning", f"{message} The application will close in 2 seconds.")
+            QTimer.singleShot(1600, QApplication.instance().exit)
+            return
+        if status != STATUS_FOUND:
+            self.win.setWindowTitle(f"A* Visualization - cost {solution.cost:.2f}, bound {solution.bound:.3f} "
+                                    f"(time budget reached)")
+
+        if self.bypass_settings:
+            logging.debug("Bypass settings is True. Quitting application.")
+            self.quit_application()
+        else:
+            self.wait_for_user_action()
 
     def wait_for_user_action(self):
         """
@@ -0,0 +1,250 @@
+import atexit
+import logging
+import multiprocessing
+from multiprocessing import shared_memory
+import search
+
+
+DEFAULT_CHUNKSIZE = 16
+MAX_ATTACHED_GRIDS = 16
+
+# Shared-memory segments attached by this worker process, keyed by segment name.
+_attached_grids = {}
+# Passable-neighbor masks and rectangle decompositions of the attached grids, built on first use.
+_grid_masks = {}
+_grid_decompositions = {}
+
+
+class SharedMaze:
+    """
+    A maze stored once in shared memory, one byte per cell in row-major order.
+    Worker processes attach to it by name instead of receiving a pickled copy.
+    """
+
+    def __init__(self, maze):
+        """
+        Copies the maze into a new shared-memory segment.
+
+        Args:
+            maze (list): The maze matrix.
+        """
+        self.rows = len(maze)
+        self.cols = len(maze[0])
+        self.shm = shared_memory.SharedMemory(create=True, size=max(1, self.rows * self.cols))
+        for row_index, row in enumerate(maze):
+            offset = row_index * self.cols
+            self.shm.buf[offset:offset + self.cols] = bytes(row)
+        # Read-only use in the creating process, e.g. checking query cells.
+        self.grid = grid_view(self.shm.buf, self.rows, self.cols)
+        logging.debug(f"Shared maze {self.shm.name} created ({self.rows}x{self.cols})")
+
+    @property
+    def descriptor(self):
+        """
+        tuple: What a worker needs to attach to the maze: (name, rows, cols).
+        """
+        return self.shm.name, self.rows, self.cols
+
+    def close(self):
+        """
+        Releases and removes the shared-memory segment.
+        """
+        logging.debug(f"Releasing shared maze {self.shm.name}")
+        for row in self.grid:
+            row.release()
+        self.shm.close()
+        self.shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def grid_view(buffer, rows, cols):
+    """
+    Builds a maze matrix over a flat byte buffer without copying it.
+
+    Args:
+        buffer (memoryview): Row-major buffer with one byte per cell.
+        rows (int): Number of rows.
+        cols (int): Number of columns.
+
+    Returns:
+        list: One memoryview per row, indexable as matrix[row][col].
+    """
+    return [buffer[row * cols:(row + 1) * cols] for row in range(rows)]
+
+
+def attach_grid(descriptor):
+    """
+    Returns the maze matrix for a shared maze, attaching to it on first use in this process.
+
+    Args:
+        descriptor (tuple): (name, rows, cols) as given by SharedMaze.descriptor.
+
+    Returns:
+        list: The maze matrix backed by shared memory.
+    """
+    name, rows, cols = descriptor
+    if name not in _attached_grids:
+        if len(_attached_grids) >= MAX_ATTACHED_GRIDS:
+            # Long-lived workers may outlive many mazes; drop the oldest attachment.
+            detach_grid(next(iter(_attached_grids)))
+        # Pool workers share the parent's resource tracker, so attaching does not
+        # take over ownership; the creating SharedMaze still unlinks the segment.
+        shm = shared_memory.SharedMemory(name=name)
+        _attached_grids[name] = (shm, grid_view(shm.buf, rows, cols))
+    return _attached_grids[name][1]
+
+
+def detach_grid(name):
+    """
+    Releases this process's view of a shared maze.
+
+    Args:
+        name (str): The shared-memory segment name.
+    """
+    shm, grid = _attached_grids.pop(name)
+    _grid_masks.pop(name, None)
+    _grid_decompositions.pop(name, None)
+    for row in grid:
+        row.release()
+    shm.close()
+
+
+def attach_masks(descriptor):
+    """
+    Returns the passable-neighbor masks of a shared maze, built once per worker.
+
+    Args:
+        descriptor (tuple): (name, rows, cols) as given by SharedMaze.descriptor.
+
+    Returns:
+        NeighborMasks: The masks of the maze.
+    """
+    name = descriptor[0]
+    if name not in _grid_masks:
+        from neighbor_mask import NeighborMasks
+        _grid_masks[name] = NeighborMasks(attach_grid(descriptor))
+    return _grid_masks[name]
+
+
+def attach_decomposition(descriptor):
+    """
+    Returns the rectangle decomposition of a shared maze, built once per worker.
+
+    Args:
+        descriptor (tuple): (name, rows, cols) as given by SharedMaze.descriptor.
+
+    Returns:
+        RectangleDecomposition: The decomposition of the maze.
+    """
+    name = descriptor[0]
+    if name not in _grid_decompositions:
+        import symmetry
+        _grid_decompositions[name] = symmetry.RectangleDecomposition(attach_grid(descriptor))
+    return _grid_decompositions[name]
+
+
+def detach_stale_grids(live):
+    """
+    Releases every shared maze attached by this process that is no longer resident,
+    together with its masks and decomposition.
+
+    Args:
+        live (collection): Segment names that are still in use.
+    """
+    for name in list(_attached_grids):
+        if name not in live:
+            detach_grid(name)
+
+
+@atexit.register
+def detach_all_grids():
+    """
+    Releases every shared maze attached by this process.
+    """
+    for name in list(_attached_grids):
+        detach_grid(name)
+
+
+def solve_query(task):
+    """
+    Worker entry point: solves one query against a shared maze.
+
+    Args:
+        task (tuple): (descriptor, index, start, goal, options) where options are
+            keyword arguments for search.find_path.
+
+    Returns:
+        tuple: (index, SearchResult).
+    """
+    descriptor, index, start, goal, options = task
+    options = dict(options)
+    timeout = options.pop('timeout', None)
+    matrix = attach_grid(descriptor)
+    engine = options.get('engine', search.ENGINE_ASTAR)
+    if engine != search.ENGINE_WAVEFRONT:
+        options['neighbor_masks'] = attach_masks(descriptor)
+    if engine == search.ENGINE_SYMMETRY:
+        options['decomposition'] = attach_decomposition(descriptor)
+    return index, search.find_path(matrix, tuple(start), tuple(goal),
+                                   deadline=search.deadline_after(timeout), **options)
+
+
+def solve_queries(descriptor, queries, live=None):
+    """
+    Worker entry point: solves a group of queries against one shared maze.
+
+    A failing query does not fail the group, since the group may mix queries
+    from different clients.
+
+    Args:
+        descriptor (tuple): (name, rows, cols) as given by SharedMaze.descriptor.
+        queries (list): (start, goal, options) triples, options as in solve_query.
+        live (collection): Segment names still resident; other attached mazes are
+            released first.
+
+    Returns:
+        list: One SearchResult, or the exception it raised, per query, in order.
+    """
+    if live is not None:
+        detach_stale_grids(set(live) | {descriptor[0]})
+    outcomes = []
+    for index, (start, goal, options) in enumerate(queries):
+        try:
+            outcomes.append(solve_query((descriptor, index, start, goal, options))[1])
+        except Exception as e:
+            logging.error(f"Query {start} -> {goal} failed: {e}")
+            outcomes.append(e)
+    return outcomes
+
+
+def run_batch(maze, queries, processes=None, chunksize=DEFAULT_CHUNKSIZE, **options):
+    """
+    Solves many independent start/goal queries on one maze across a process pool.
+
+    The maze is placed in shared memory once; each task only carries the segment
+    name and its query. Results are yielded in completion order.
+
+    Args:
+        maze (list or SharedMaze): The maze matrix, or a maze already in shared memory.
+        queries (iterable): (start, goal) pairs.
+        processes (int): Number of worker processes, defaults to the CPU count.
+        chunksize (int): Queries handed to a worker at a time.
+        **options: Search limits (timeout, max_expansions, cost, heuristic) applied to every query.
+
+    Yields:
+        tuple: (index, SearchResult) where index is the query's position in queries.
+    """
+    owns_maze = not isinstance(maze, SharedMaze)
+    shared = SharedMaze(maze) if owns_maze else maze
+    try:
+        tasks = ((shared.descriptor, index, start, goal, options) for index, (start, goal) in enumerate(queries))
+        with multiprocessing.Pool(processes) as pool:
+            yield from pool.imap_unordered(solve_query, tasks, chunksize)
+    finally:
+        if owns_maze:
+            shared.close()
@@ -0,0 +1,182 @@
+import argparse
+import json
+import logging
+import sys
+import search
+from utils import load_maze
+
+
+IN_FLIGHT_PER_JOB = 4
+
+
+def read_queries(stream, maze=None):
+    """
+    Parses JSONL queries lazily, one per non-empty line.
+
+    Each line is an object with 'start' and 'goal' as [row, col] and optional
+    'id', 'timeout' and 'max_expansions'.
+
+    Args:
+        stream (file): Text stream of JSONL queries.
+        maze (list): The maze; when given, start and goal must be free cells inside it.
+
+    Yields:
+        tuple: (index, query dict), or (index, error message) for malformed lines,
+        cells outside the maze or on obstacles, and invalid limits.
+    """
+    index = 0
+    for line in stream:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            query = json.loads(line)
+            if maze is None:
+                query['start'], query['goal'] = tuple(query['start']), tuple(query['goal'])
+            else:
+                query['start'] = search.check_cell(maze, query['start'])
+                query['goal'] = search.check_cell(maze, query['goal'])
+            search.check_options(query.get('timeout'), query.get('max_expansions'))
+            yield index, query
+        except (ValueError, KeyError, TypeError) as e:
+            yield index, f"Invalid query: {e}"
+        index += 1
+
+
+def query_options(query, args):
+    """
+    Returns the search limits for a query, falling back to the command-line defaults.
+    """
+    options = {}
+    timeout = query.get('timeout', args.timeout)
+    max_expansions = query.get('max_expansions', args.max_expansions)
+    if timeout is not None:
+        options['timeout'] = timeout
+    if max_expansions is not None:
+        options['max_expansions'] = max_expansions
+    if args.heuristic == 'euclidean':
+        # The octile heuristic overestimates Euclidean diagonals, so both change together.
+        options['cost'] = search.euclidean_distance
+        options['heuristic'] = search.euclidean_distance
+    if args.engine != search.ENGINE_ASTAR:
+        options['engine'] = args.engine
+    if args.max_nodes is not None:
+        options['max_nodes'] = args.max_nodes
+    return options
+
+
+def format_result(index, query, result):
+    """
+    Builds the output record for one query.
+
+    Returns:
+        dict: Query index and id plus status, path, cost, expansions and time.
+    """
+    return {
+        'index': index,
+        'id': query.get('id'),
+        'status': result.status,
+        'path': result.path.tolist(),
+        'cost': result.cost,
+        'expansions': result.stats['expansions'],
+        'time': result.stats['elapsed'],
+    }
+
+
+def write_record(record, output):
+    output.write(json.dumps(record) + '\n')
+    output.flush()
+
+
+def run_sequential(maze, queries, args, output):
+    """
+    Solves queries one at a time in input order.
+    """
+    neighbor_masks = None
+    decomposition = None
+    solved = 0
+    for index, query in queries:
+        if isinstance(query, str):
+            write_record({'index': index, 'error': query}, output)
+            continue
+        options = query_options(query, args)
+        timeout = options.pop('timeout', None)
+        if solved == 1 and args.engine != search.ENGINE_WAVEFRONT:
+            # Built once a second query arrives, so single queries skip the NumPy import.
+            from neighbor_mask import NeighborMasks
+            neighbor_masks = NeighborMasks(maze)
+        if decomposition is None and args.engine == search.ENGINE_SYMMETRY:
+            import symmetry
+            decomposition = symmetry.RectangleDecomposition(maze)
+        solved += 1
+        result = search.find_path(maze, query['start'], query['goal'], deadline=search.deadline_after(timeout),
+                                  neighbor_masks=neighbor_masks, decomposition=decomposition, **options)
+        write_record(format_result(index, query, result), output)
+
+
+def run_parallel(maze, queries, args, output):
+    """
+    Solves queries on a process pool, writing results in completion order.
+    At most IN_FLIGHT_PER_JOB queries per worker are read ahead, so memory
+    stays bounded however long the input is.
+    """
+    # Multiprocessing is only imported when parallelism is asked for, to keep startup fast.
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+    import batch
+    max_in_flight = args.jobs * IN_FLIGHT_PER_JOB
+    in_flight = {}
+
+    def write_done(done):
+        for future in done:
+            index, result = future.result()
+            write_record(format_result(index, in_flight.pop(future), result), output)
+
+    with batch.SharedMaze(maze) as shared, ProcessPoolExecutor(args.jobs) as pool:
+        for index, query in queries:
+            if isinstance(query, str):
+                write_record({'index': index, 'error': query}, output)
+                continue
+            task = (shared.descriptor, index, query['start'], query['goal'], query_options(query, args))
+            in_flight[pool.submit(batch.solve_query, task)] = query
+            if len(in_flight) >= max_in_flight:
+                write_done(wait(in_flight, return_when=FIRST_COMPLETED).done)
+        write_done(wait(in_flight).done)
+
+
+def main(argv=None):
+    """
+    Command-line entry point for headless batch path queries.
+    """
+    parser = argparse.ArgumentParser(description="Solve A* path queries without the GUI, streaming JSONL results.")
+    parser.add_argument('maze', help="Maze file (JSON rows, or text rows of 0/1 or ./#)")
+    parser.add_argument('queries', nargs='?', default='-', help="JSONL query file, or - for stdin (default)")
+    parser.add_argument('-o', '--output', default='-', help="Output JSONL file, or - for stdout (default)")
+    parser.add_argument('--heuristic', choices=['octile', 'euclidean'], default='octile', help="Step cost model")
+    parser.add_argument('--engine', choices=[search.ENGINE_ASTAR, search.ENGINE_WAVEFRONT, search.ENGINE_FRONTIER,
+                                             search.ENGINE_SYMMETRY],
+                        default=search.ENGINE_ASTAR, help="Search backend")
+    parser.add_argument('--max-nodes', type=int, help="Memory cap in stored cells for the frontier engine")
+    parser.add_argument('--timeout', type=float, help="Default per-query timeout in seconds")
+    parser.add_argument('--max-expansions', type=int, help="Default per-query expansion budget")
+    parser.add_argument('-j', '--jobs', type=int, default=1, help="Worker processes (default: 1, in-process)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    maze = load_maze(args.maze)
+    source = sys.stdin if args.queries == '-' else open(args.queries)
+    output = sys.stdout if args.output == '-' else open(args.output, 'w')
+    try:
+        queries = read_queries(source, maze)
+        if args.jobs > 1:
+            run_parallel(maze, queries, args, output)
+        else:
+            run_sequential(maze, queries, args, output)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,209 @@
+import operator
+import struct
+
+
+# Unit moves of the 8-connected grid. A path step is stored as its index here.
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (-1, -1), (1, -1), (-1, 1)]
+DIRECTION_CODES = {direction: code for code, direction in enumerate(DIRECTIONS)}
+
+# Serialized header: start row, start column and number of steps.
+HEADER = struct.Struct('>iiI')
+
+
+class CompactPath:
+    """
+    A path stored as its start cell plus one direction code per step.
+
+    Takes one byte per step instead of a (row, col) tuple per cell. Cells are
+    produced lazily when iterating; len(), indexing and slicing behave like the
+    equivalent list of cells, so it can be passed wherever a path list was used.
+    """
+
+    __slots__ = ('start', 'codes')
+
+    def __init__(self, start, codes=b''):
+        """
+        Initializes the path.
+
+        Args:
+            start (tuple): The first cell, or None for an empty path.
+            codes (bytes): Indices into DIRECTIONS, one per step.
+        """
+        self.start = None if start is None else tuple(start)
+        self.codes = bytes(codes)
+
+    @classmethod
+    def from_cells(cls, cells):
+        """
+        Builds a compact path from a sequence of adjacent cells.
+
+        Args:
+            cells (iterable): The cells of the path.
+
+        Returns:
+            CompactPath: The path.
+
+        Raises:
+            ValueError: If two consecutive cells are not neighbors.
+        """
+        cells = iter(cells)
+        start = next(cells, None)
+        codes = bytearray()
+        previous = start
+        for cell in cells:
+            step = (cell[0] - previous[0], cell[1] - previous[1])
+            if step not in DIRECTION_CODES:
+                raise ValueError(f"Cells {previous} and {cell} are not adjacent")
+            codes.append(DIRECTION_CODES[step])
+            previous = cell
+        return cls(start, codes)
+
+    def __len__(self):
+        return 0 if self.start is None else len(self.codes) + 1
+
+    def __iter__(self):
+        if self.start is None:
+            return
+        row, col = self.start
+        yield row, col
+        for code in self.codes:
+            dx, dy = DIRECTIONS[code]
+            row += dx
+            col += dy
+            yield row, col
+
+    def _cell_at(self, index):
+        """
+        Returns the cell after index steps, counting steps per direction instead of walking.
+        """
+        row, col = self.start
+        steps = self.codes[:index]
+        for code, (dx, dy) in enumerate(DIRECTIONS):
+            count = steps.count(code)
+            row += count * dx
+            col += count * dy
+        return row, col
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            first, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            if stop <= first:
+                return CompactPath(None)
+            return CompactPath(self._cell_at(first), self.codes[first:stop - 1])
+        index = operator.index(index)
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("path index out of range")
+        return self._cell_at(index)
+
+    def __eq__(self, other):
+        # Only paths compare equal, so equality stays consistent with __hash__;
+        # compare list(path) to a list of cells instead.
+        if isinstance(other, CompactPath):
+            return self.start == other.start and self.codes == other.codes
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.start, self.codes))
+
+    def __repr__(self):
+        return f"CompactPath(start={self.start}, end={self.end}, cells={len(self)})"
+
+    def __reduce__(self):
+        # Pickle through the packed form so paths stay small across process boundaries.
+        return CompactPath.from_bytes, (self.to_bytes(),)
+
+    @property
+    def end(self):
+        """
+        tuple: The last cell, or None for an empty path.
+        """
+        return None if self.start is None else self._cell_at(len(self.codes))
+
+    def cost(self, step_cost=None):
+        """
+        Returns the total cost of the path.
+
+        Args:
+            step_cost (function): Step cost between two adjacent cells, defaults to
+                search.octile_distance.
+
+        Returns:
+            float: The summed step costs.
+        """
+        if step_cost is None:
+            from search import octile_distance as step_cost
+        return sum(self.codes.count(code) * step_cost((0, 0), direction)
+                   for code, direction in enumerate(DIRECTIONS))
+
+    def tolist(self):
+        """
+        Returns the cells as [row, col] lists, ready for JSON.
+        """
+        return [[row, col] for row, col in self]
+
+    def to_numpy(self):
+        """
+        Returns the cells as an (n, 2) integer array of (row, col) coordinates.
+        """
+        import numpy as np
+        coords = np.zeros((len(self), 2), dtype=np.int64)
+        if self.start is not None:
+            steps = np.array(DIRECTIONS, dtype=np.int64)[np.frombuffer(self.codes, dtype=np.uint8)]
+            coords[0] = self.start
+            np.cumsum(steps, axis=0, out=coords[1:])
+            coords[1:] += self.start
+        return coords
+
+    def to_bytes(self):
+        """
+        Serializes the path: a fixed header followed by two direction codes per byte.
+
+        Returns:
+            bytes: The packed path.
+        """
+        row, col = (-1, -1) if self.start is None else self.start
+        padded = self.codes + b'\0' * (len(self.codes) % 2)
+        packed = bytes(high << 4 | low for high, low in zip(padded[0::2], padded[1::2]))
+        return HEADER.pack(row, col, len(self.codes)) + packed
+
+    @classmethod
+    def from_bytes(cls, data):
+        """
+        Inverse of to_bytes.
+
+        Args:
+            data (bytes): A packed path.
+
+        Returns:
+            CompactPath: The path.
+        """
+        row, col, steps = HEADER.unpack_from(data)
+        if row < 0:
+            return cls(None)
+        codes = bytes(code for byte in data[HEADER.size:] for code in (byte >> 4, byte & 0x0F))
+        return cls((row, col), codes[:steps])
+
+
+def reconstruct_compact_path(came_from, current, start):
+    """
+    Reconstructs the path from the start to the current node as a CompactPath.
+
+    Args:
+        came_from (dict): Maps each reached cell to its adjacent predecessor.
+        current (tuple): The current node.
+        start (tuple): The start node.
+
+    Returns:
+        CompactPath: The path from the start node to the current node.
+    """
+    codes = bytearray()
+    while current != start:
+        previous = came_from[current]
+        codes.append(DIRECTION_CODES[(current[0] - previous[0], current[1] - previous[1])])
+        current = previous
+    codes.reverse()
+    return CompactPath(start, codes)
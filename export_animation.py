@@ -0,0 +1,276 @@
+import argparse
+import os
+import struct
+import sys
+import time
+import zlib
+import numpy as np
+import search
+from maze_image import (build_state_image, build_lookup_table, apply_events, CELL_PATH, CELL_START,
+                        CELL_GOAL)
+from utils import load_maze
+
+
+DEFAULT_STEPS_PER_FRAME = 50
+DEFAULT_SCALE = 4
+DEFAULT_FPS = 30
+DEFAULT_COMPRESS_LEVEL = 6
+FORMAT_APNG = 'apng'
+FORMAT_PNG_SEQUENCE = 'png'
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+
+def png_chunk(tag, data):
+    """
+    Returns one PNG chunk: length, tag, data and CRC.
+    """
+    return struct.pack('>I', len(data)) + tag + data + struct.pack('>I', zlib.crc32(tag + data))
+
+
+def compress_frame(frame, level=DEFAULT_COMPRESS_LEVEL):
+    """
+    Compresses an indexed frame into PNG image data (filter type 0 on every row).
+
+    Args:
+        frame (np.ndarray): (height, width) uint8 array of palette indices.
+        level (int): zlib compression level.
+
+    Returns:
+        bytes: The zlib stream for an IDAT or fdAT chunk.
+    """
+    rows = np.zeros((frame.shape[0], frame.shape[1] + 1), dtype=np.uint8)
+    rows[:, 1:] = frame
+    return zlib.compress(rows.tobytes(), level)
+
+
+def header_chunks(width, height, palette):
+    """
+    Returns the IHDR and PLTE chunks of an 8-bit indexed-color PNG.
+    """
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 3, 0, 0, 0)
+    return png_chunk(b'IHDR', ihdr) + png_chunk(b'PLTE', np.asarray(palette, dtype=np.uint8).tobytes())
+
+
+def write_png(path, frame, palette, level=DEFAULT_COMPRESS_LEVEL):
+    """
+    Writes an indexed frame as a PNG file using only zlib.
+
+    Args:
+        path (str): Destination file.
+        frame (np.ndarray): (height, width) uint8 array of palette indices.
+        palette (np.ndarray): (colors, 3) uint8 RGB lookup table.
+        level (int): zlib compression level.
+    """
+    height, width = frame.shape
+    with open(path, 'wb') as file:
+        file.write(PNG_SIGNATURE + header_chunks(width, height, palette))
+        file.write(png_chunk(b'IDAT', compress_frame(frame, level)))
+        file.write(png_chunk(b'IEND', b''))
+
+
+def frame_chunks(frame, sequence, delay, fps, level=DEFAULT_COMPRESS_LEVEL):
+    """
+    Returns the fcTL and image data chunks of one APNG frame.
+
+    Args:
+        frame (tuple): (pixels, x, y) with a (height, width) uint8 array of palette
+            indices drawn at pixel offset (x, y).
+        sequence (int): Sequence number of the frame's fcTL chunk; 0 stores the
+            frame as IDAT, the still image shown by plain PNG viewers.
+        delay (int): Display time in 1/fps seconds.
+        fps (int): Frames per second.
+        level (int): zlib compression level.
+
+    Returns:
+        tuple: (chunk bytes, next sequence number).
+    """
+    pixels, x, y = frame
+    height, width = pixels.shape
+    # dispose_op NONE and blend_op SOURCE: each frame paints over what is already shown.
+    control = png_chunk(b'fcTL', struct.pack('>IIIIIHHBB', sequence, width, height, int(x), int(y), delay, fps, 0, 0))
+    data = compress_frame(pixels, level)
+    if sequence == 0:
+        return control + png_chunk(b'IDAT', data), 1
+    return control + png_chunk(b'fdAT', struct.pack('>I', sequence + 1) + data), sequence + 2
+
+
+def write_apng(path, frames, palette, fps=DEFAULT_FPS, level=DEFAULT_COMPRESS_LEVEL):
+    """
+    Writes indexed frames as an animated PNG that plays once.
+
+    The first frame covers the whole image; later frames only cover the region
+    that changed. Frames are compressed and written as they arrive, holding back
+    one so the last can be shown longer, and the frame count in acTL is filled in
+    once it is known.
+
+    Args:
+        path (str): Destination file.
+        frames (iterable): (pixels, x, y) tuples as yielded by compose_frames.
+        palette (np.ndarray): (colors, 3) uint8 RGB lookup table.
+        fps (int): Frames per second.
+        level (int): zlib compression level.
+
+    Returns:
+        int: Number of frames written.
+    """
+    frames = iter(frames)
+    held = next(frames, None)
+    if held is None:
+        raise ValueError("No frames to write")
+
+    height, width = held[0].shape
+    count = 0
+    sequence = 0
+    with open(path, 'wb') as file:
+        file.write(PNG_SIGNATURE + header_chunks(width, height, palette))
+        animation_control = file.tell()
+        file.write(png_chunk(b'acTL', struct.pack('>II', 0, 1)))
+        for frame in frames:
+            chunks, sequence = frame_chunks(held, sequence, 1, fps, level)
+            file.write(chunks)
+            count += 1
+            held = frame
+        # Hold the last frame, which shows the path, for a second.
+        chunks, sequence = frame_chunks(held, sequence, fps, fps, level)
+        file.write(chunks)
+        count += 1
+        file.write(png_chunk(b'IEND', b''))
+        file.seek(animation_control)
+        file.write(png_chunk(b'acTL', struct.pack('>II', count, 1)))
+    return count
+
+
+def upscale(image, scale):
+    """
+    Enlarges an image by an integer factor, repeating each cell as a scale x scale block.
+    """
+    if scale == 1:
+        return np.ascontiguousarray(image)
+    return np.repeat(np.repeat(image, scale, axis=0), scale, axis=1)
+
+
+def changed_box(image, previous):
+    """
+    Returns the bounds of the cells that differ between two state images.
+
+    Returns:
+        tuple: (x0, y0, x1, y1) in cells, end-exclusive, or None if nothing changed.
+    """
+    changed = image != previous
+    xs = np.flatnonzero(changed.any(axis=1))
+    if not xs.size:
+        return None
+    ys = np.flatnonzero(changed.any(axis=0))
+    return xs[0], ys[0], xs[-1] + 1, ys[-1] + 1
+
+
+def compose_frames(maze, start, goal, events, steps_per_frame=DEFAULT_STEPS_PER_FRAME, scale=DEFAULT_SCALE):
+    """
+    Replays search events onto the maze state image and yields a frame every few steps.
+
+    Only the first frame is the whole maze; each later one is the bounding box of
+    the cells its steps changed, so frames stay small however large the maze is.
+
+    Args:
+        maze (list): The maze matrix.
+        start (tuple): The start cell.
+        goal (tuple): The goal cell.
+        events (iterable): SearchEvents, e.g. from search.astar().
+        steps_per_frame (int): Expansions shown per frame.
+        scale (int): Pixels per cell side.
+
+    Yields:
+        tuple: (pixels, x, y) where pixels is a uint8 array of maze_image states
+        drawn at pixel offset (x, y), ending with a frame that shows the path when
+        one was found. Steps that change nothing are skipped.
+    """
+    image = build_state_image(maze)
+    image[start[1], start[0]] = CELL_START
+    image[goal[1], goal[0]] = CELL_GOAL
+    previous = image.copy()
+    endpoints = (start, goal)
+    yield upscale(image.T, scale), 0, 0
+    for batch in search.batch_events(events, steps_per_frame):
+        apply_events(image, batch, endpoints)
+        final = batch[-1]
+        if final.status == search.STATUS_FOUND:
+            cells = final.path[1:-1].to_numpy()
+            image[cells[:, 1], cells[:, 0]] = CELL_PATH
+        box = changed_box(image, previous)
+        if box is None:
+            continue
+        x0, y0, x1, y1 = box
+        previous[x0:x1, y0:y1] = image[x0:x1, y0:y1]
+        yield upscale(image[x0:x1, y0:y1].T, scale), x0 * scale, y0 * scale
+
+
+def export_search(maze, start, goal, output, steps_per_frame=DEFAULT_STEPS_PER_FRAME, scale=DEFAULT_SCALE,
+                  fps=DEFAULT_FPS, output_format=FORMAT_APNG, settings=None, level=DEFAULT_COMPRESS_LEVEL):
+    """
+    Runs A* on a maze and exports the search as an animation, without a display.
+
+    Args:
+        maze (list): The maze matrix.
+        start (tuple): The start cell.
+        goal (tuple): The goal cell.
+        output (str): Animated PNG file, or directory for a PNG sequence.
+        steps_per_frame (int): Expansions shown per frame.
+        scale (int): Pixels per cell side.
+        fps (int): Playback rate of the animated PNG.
+        output_format (str): FORMAT_APNG or FORMAT_PNG_SEQUENCE.
+        settings (dict): Color settings, defaults to the built-in colors.
+        level (int): zlib compression level.
+
+    Returns:
+        int: Number of frames written.
+    """
+    palette = build_lookup_table(settings or {})
+    frames = compose_frames(maze, start, goal, search.astar(maze, start, goal), steps_per_frame, scale)
+    if output_format == FORMAT_APNG:
+        return write_apng(output, frames, palette, fps, level)
+    if output_format != FORMAT_PNG_SEQUENCE:
+        raise ValueError(f"Unknown output format: {output_format}")
+    os.makedirs(output, exist_ok=True)
+    count = 0
+    canvas = None
+    for count, (pixels, x, y) in enumerate(frames, 1):
+        if canvas is None:
+            canvas = pixels.copy()
+        else:
+            canvas[y:y + pixels.shape[0], x:x + pixels.shape[1]] = pixels
+        write_png(os.path.join(output, f"frame_{count - 1:06d}.png"), canvas, palette, level)
+    return count
+
+
+def main(argv=None):
+    """
+    Command-line entry point for headless animation export.
+    """
+    parser = argparse.ArgumentParser(description="Export an A* search as an animated PNG or PNG sequence.")
+    parser.add_argument('maze', help="Maze file (JSON rows or text rows of 0/1 or ./#)")
+    parser.add_argument('output', help="Output .png file, or directory with --format png")
+    parser.add_argument('--start', type=int, nargs=2, default=None, metavar=('ROW', 'COL'),
+                        help="Start cell (default: top-left)")
+    parser.add_argument('--goal', type=int, nargs=2, default=None, metavar=('ROW', 'COL'),
+                        help="Goal cell (default: bottom-right)")
+    parser.add_argument('--steps-per-frame', type=int, default=DEFAULT_STEPS_PER_FRAME, help="Expansions per frame")
+    parser.add_argument('--scale', type=int, default=DEFAULT_SCALE, help="Pixels per cell side")
+    parser.add_argument('--fps', type=int, default=DEFAULT_FPS, help="Playback rate of the animated PNG")
+    parser.add_argument('--format', choices=[FORMAT_APNG, FORMAT_PNG_SEQUENCE], default=FORMAT_APNG,
+                        help="Animated PNG file or a directory of numbered PNG frames")
+    parser.add_argument('--compress-level', type=int, default=DEFAULT_COMPRESS_LEVEL, choices=range(10),
+                        metavar='0-9', help="zlib compression level")
+    args = parser.parse_args(argv)
+
+    maze = load_maze(args.maze)
+    start = tuple(args.start) if args.start else (0, 0)
+    goal = tuple(args.goal) if args.goal else (len(maze) - 1, len(maze[0]) - 1)
+    started = time.perf_counter()
+    count = export_search(maze, start, goal, args.output, args.steps_per_frame, args.scale, args.fps,
+                          args.format, level=args.compress_level)
+    print(f"Wrote {count} frames to {args.output} in {time.perf_counter() - started:.2f}s", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
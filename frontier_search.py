@@ -0,0 +1,278 @@
+import heapq
+import time
+import search
+from compact_path import CompactPath
+
+
+# Estimated bytes per stored node: dict slot, record list, cell tuple and heap entry.
+NODE_BYTES_ESTIMATE = 280
+# Segments at most this costly are solved with plain A*, which keeps its full bookkeeping.
+BASE_CASE_COST = 48
+OPPOSITE_BITS = [1 << search.DIRECTIONS.index((-dx, -dy)) for dx, dy in search.DIRECTIONS]
+
+
+class _SearchStopped(Exception):
+    """
+    Raised inside the memory-bounded search when a limit is hit.
+    """
+
+    def __init__(self, status):
+        super().__init__(status)
+        self.status = status
+
+
+class FrontierSearch:
+    """
+    Memory-bounded A*: frontier search plus divide-and-conquer path recovery.
+
+    Closed cells are dropped instead of kept in g_score/came_from dictionaries.
+    Each open cell remembers which of its neighbors were already expanded, so
+    dropped cells are never regenerated, and a relay cell about halfway along
+    its best path. Once the goal is reached, the path is rebuilt by solving
+    start-to-relay and relay-to-goal recursively. Stored cells stay on the order
+    of the frontier size instead of the explored area, at the cost of repeating
+    searches. Paths stay optimal as long as the heuristic is consistent with the
+    step cost (true for the default octile cost and heuristic).
+    """
+
+    def __init__(self, matrix, cost=search.octile_distance, heuristic=search.octile_distance,
+                 deadline=None, max_expansions=None, cancel_token=None, max_nodes=None, neighbor_masks=None):
+        """
+        Initializes the search.
+
+        Args:
+            matrix (list): The maze matrix.
+            cost (function): Step cost between two adjacent cells.
+            heuristic (function): Consistent estimate of the distance to the goal.
+            deadline (float): time.monotonic() value after which the search gives up.
+            max_expansions (int): Maximum number of cells to expand over all passes.
+            cancel_token (CancelToken): Token polled for cooperative cancellation.
+            max_nodes (int): Memory cap, in cells stored at once.
+            neighbor_masks (NeighborMasks): Optional precomputed passable-neighbor masks.
+        """
+        self.matrix = matrix
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        self.cost = cost
+        self.heuristic = heuristic
+        self.deadline = deadline
+        self.max_expansions = max_expansions
+        self.cancel_token = cancel_token
+        self.max_nodes = max_nodes
+        self.neighbor_masks = neighbor_masks
+        self.expansions = 0
+        self.peak_nodes = 0
+        self.passes = 0
+        # Final goal and the (heuristic, cell) expanded closest to it, for partial paths.
+        self.goal = None
+        self.closest = None
+
+    def _record_nodes(self, stored):
+        """
+        Tracks peak storage and enforces the memory cap.
+        """
+        if stored > self.peak_nodes:
+            self.peak_nodes = stored
+            if self.max_nodes is not None and stored > self.max_nodes:
+                raise _SearchStopped(search.STATUS_BUDGET_EXHAUSTED)
+
+    def _count_expansion(self):
+        self.expansions += 1
+        status = search._limit_status(self.expansions, self.deadline, self.max_expansions, self.cancel_token)
+        if status is not None:
+            raise _SearchStopped(status)
+
+    def frontier_pass(self, start, goal, relay_threshold):
+        """
+        Runs one frontier A* pass from start to goal.
+
+        Args:
+            start (tuple): The start cell.
+            goal (tuple): The goal cell.
+            relay_threshold (float): g value at which a path records its relay cell.
+
+        Returns:
+            tuple: (cost to goal, relay cell, relay g), or None if the goal is unreachable.
+        """
+        self.passes += 1
+        heuristic = self.heuristic
+        matrix, rows, cols = self.matrix, self.rows, self.cols
+        masks = self.neighbor_masks
+        # Open cell -> [g, bitmask of neighbors already expanded, relay cell, relay g]
+        open_nodes = {start: [0, 0, None, None]}
+        open_set = [(heuristic(start, goal), start)]
+        track_closest = goal == self.goal
+
+        while open_set:
+            f, current = heapq.heappop(open_set)
+            record = open_nodes.get(current)
+            if record is None or f != record[0] + heuristic(current, goal):
+                continue
+            g, used, relay, relay_g = record
+            if current == goal:
+                return g, relay, relay_g
+            del open_nodes[current]
+            if track_closest and (self.closest is None or f - g < self.closest[0]):
+                self.closest = (f - g, current)
+            self._count_expansion()
+
+            if masks is None:
+                candidates = search.MASK_INDICES[~used & 0xFF]
+            else:
+                candidates = search.MASK_INDICES[masks[current[0]][current[1]] & ~used]
+            for index in candidates:
+                dx, dy = search.DIRECTIONS[index]
+                neighbor = current[0] + dx, current[1] + dy
+                if masks is None and (not (0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols)
+                                      or matrix[neighbor[0]][neighbor[1]] != 0):
+                    continue
+                tentative_g_score = g + self.cost(current, neighbor)
+                if relay is None and tentative_g_score >= relay_threshold:
+                    neighbor_relay, neighbor_relay_g = neighbor, tentative_g_score
+                else:
+                    neighbor_relay, neighbor_relay_g = relay, relay_g
+                neighbor_record = open_nodes.get(neighbor)
+                if neighbor_record is None:
+                    open_nodes[neighbor] = [tentative_g_score, OPPOSITE_BITS[index], neighbor_relay, neighbor_relay_g]
+                elif tentative_g_score < neighbor_record[0]:
+                    neighbor_record[0] = tentative_g_score
+                    neighbor_record[1] |= OPPOSITE_BITS[index]
+                    neighbor_record[2] = neighbor_relay
+                    neighbor_record[3] = neighbor_relay_g
+                else:
+                    neighbor_record[1] |= OPPOSITE_BITS[index]
+                    continue
+                heapq.heappush(open_set, (tentative_g_score + heuristic(neighbor, goal), neighbor))
+
+            if len(open_set) > 2 * len(open_nodes) + 64:
+                # Drop stale heap entries so they do not count against the memory cap.
+                open_set = [(record[0] + heuristic(node, goal), node) for node, record in open_nodes.items()]
+                heapq.heapify(open_set)
+            self._record_nodes(len(open_nodes) + len(open_set))
+        return None
+
+    def base_case(self, start, goal, bounded=True):
+        """
+        Solves a short segment with plain A*.
+
+        Args:
+            start (tuple): The start cell.
+            goal (tuple): The goal cell.
+            bounded (bool): Stop A* before it could exceed the memory cap.
+
+        Returns:
+            list: The path, or None if plain A* would not fit under the memory cap.
+        """
+        limit = None if self.max_expansions is None else max(0, self.max_expansions - self.expansions)
+        capped = False
+        if bounded and self.max_nodes is not None:
+            # A* stores at most 2 * (1 + 8 * expansions) cells, so this many expansions fit under the cap.
+            fitting = max(1, (self.max_nodes // 2 - 1) // 8)
+            if limit is None or fitting < limit:
+                limit, capped = fitting, True
+        result = search.run_search(search.astar(self.matrix, start, goal, self.cost, self.heuristic,
+                                                self.deadline, limit, self.cancel_token,
+                                                self.neighbor_masks))
+        self.expansions += result.stats['expansions']
+        if capped and result.status == search.STATUS_BUDGET_EXHAUSTED:
+            return None
+        self._record_nodes(result.stats['peak_nodes'])
+        if result.status != search.STATUS_FOUND:
+            raise _SearchStopped(result.status)
+        return list(result.path)
+
+    def segment(self, start, goal, known_cost=None):
+        """
+        Returns an optimal path from start to goal, recursing through relay cells.
+
+        Short segments are solved with plain A*. When that would not fit under the
+        memory cap, the segment is split with frontier passes instead, so a tight
+        cap costs more passes rather than failing.
+
+        Args:
+            start (tuple): The start cell.
+            goal (tuple): The goal cell.
+            known_cost (float): Optimal cost of the segment if already known.
+
+        Returns:
+            list: The path, or None if goal is unreachable from start.
+        """
+        if start == goal:
+            return [start]
+        if known_cost is not None and known_cost <= BASE_CASE_COST:
+            path = self.base_case(start, goal)
+            if path is not None:
+                return path
+        found = self.frontier_pass(start, goal, self.heuristic(start, goal) / 2)
+        if found is None:
+            return None
+        total_cost, relay, relay_g = found
+        if known_cost is None and total_cost <= BASE_CASE_COST:
+            path = self.base_case(start, goal)
+            if path is not None:
+                return path
+        if relay in (None, start, goal) or not total_cost / 4 <= relay_g <= 3 * total_cost / 4:
+            # The heuristic midpoint was far from the real one; split at half the known cost.
+            total_cost, relay, relay_g = self.frontier_pass(start, goal, total_cost / 2)
+            if relay in (None, start, goal):
+                # Cheaper than three straight steps, so A* only stores a handful of cells.
+                return self.base_case(start, goal, bounded=False)
+        head = self.segment(start, relay, relay_g)
+        tail = self.segment(relay, goal, total_cost - relay_g)
+        return head + tail[1:]
+
+
+def memory_bounded_search(matrix, start, goal, cost=search.octile_distance, heuristic=search.octile_distance,
+                          deadline=None, max_expansions=None, cancel_token=None, max_nodes=None,
+                          neighbor_masks=None):
+    """
+    Finds an optimal path while storing only the search frontier.
+
+    Args:
+        matrix (list): The maze matrix.
+        start (tuple): The start cell.
+        goal (tuple): The goal cell.
+        cost (function): Step cost between two adjacent cells.
+        heuristic (function): Consistent estimate of the distance to the goal.
+        deadline (float): time.monotonic() value after which the search gives up.
+        max_expansions (int): Maximum number of cells to expand over all passes.
+        cancel_token (CancelToken): Token polled for cooperative cancellation.
+        max_nodes (int): Memory cap, in cells stored at once. Segments too large for
+            plain A* under the cap are split further; only a frontier that alone
+            exceeds the cap stops the search with STATUS_BUDGET_EXHAUSTED.
+        neighbor_masks (NeighborMasks): Optional precomputed passable-neighbor masks.
+
+    Returns:
+        SearchResult: Status, path, cost and stats. The stats include peak_nodes and
+        peak_bytes, an estimate of the peak bookkeeping memory. When the budget runs
+        out, the path to the expanded cell closest to the goal is rebuilt under the
+        same limits if possible. Without any path the result carries just [start] and
+        cost None.
+    """
+    started = time.perf_counter()
+    engine = FrontierSearch(matrix, cost, heuristic, deadline, max_expansions, cancel_token, max_nodes,
+                            neighbor_masks)
+    engine.goal = goal
+    try:
+        path = engine.segment(start, goal)
+        status = search.STATUS_FOUND if path is not None else search.STATUS_UNREACHABLE
+    except _SearchStopped as stopped:
+        path, status = None, stopped.status
+        if status == search.STATUS_BUDGET_EXHAUSTED and engine.closest is not None:
+            try:
+                path = engine.segment(start, engine.closest[1])
+            except _SearchStopped:
+                path = None
+    if path is None:
+        path, path_cost = CompactPath.from_cells([start]), None
+    else:
+        path = CompactPath.from_cells(path)
+        path_cost = path.cost(cost)
+    stats = {
+        'expansions': engine.expansions,
+        'passes': engine.passes,
+        'peak_nodes': engine.peak_nodes,
+        'peak_bytes': engine.peak_nodes * NODE_BYTES_ESTIMATE,
+        'elapsed': time.perf_counter() - started,
+    }
+    return search.SearchResult(status, path, path_cost, stats)
@@ -2,9 +2,7 @@ import logging
 import sys
 import time
 import csv
-import pandas as pd
-from AstarApplication import AStarApplication
-from utils import generate_maze
+from utils import generate_maze, setup_logging
 
 
 def run_tests():
@@ -15,6 +13,7 @@ def run_tests():
     Calculates the average execution time for each maze size and obstacle density.
     Writes the results to a CSV file and an Excel file.
     """
+    from AstarApplication import AStarApplication
     results = []
     for maze_size in range(10, 110, 10):
         for obstacle_density in [i / 10 for i in range(0, 10)]:
@@ -33,6 +32,7 @@ def run_tests():
                     'obstacle_color': '#000000',
                     'background_color': '#ffffff',
                     'expanded_node_color': '#808080',
+                    'frontier_node_color': '#87CEEB',
                     'maze': generate_maze(maze_size, obstacle_density),
                 }
                 start_time = time.time()
@@ -49,17 +49,56 @@ def run_tests():
         writer.writerow(["Maze Size", "Obstacle Density", "Average Execution Time"])
         writer.writerows(results)
 
+    import pandas as pd  # Only needed for the Excel export
     df = pd.read_csv('results.csv')
     df.to_excel('results.xlsx', index=False)
 
 
+def run_scenario_tests(families=None, sizes=(64, 128, 256), seeds=(0, 1, 2), engine='astar'):
+    """
+    Benchmarks the headless search on the cached scenario library.
+    Runs every start/goal query of every scenario once and records the average time
+    and expansions per scenario family and size.
+    Writes the results to a CSV file.
+
+    Args:
+        families (list): Scenario families to run, defaults to all of them.
+        sizes (tuple): Maze sizes.
+        seeds (tuple): Scenario seeds.
+        engine (str): Search backend passed to search.find_path.
+    """
+    import search
+    from scenarios import scenario_library
+    totals = {}
+    for scenario in scenario_library(families, sizes, seeds):
+        key = (scenario.family, scenario.size)
+        for start, goal in scenario.queries:
+            start_time = time.time()
+            result = search.find_path(scenario.maze, start, goal, engine=engine)
+            exec_time = time.time() - start_time
+            totals.setdefault(key, []).append((exec_time, result.stats['expansions'], result.status == search.STATUS_FOUND))
+
+    results = []
+    for (family, maze_size), runs in totals.items():
+        avg_exec_time = sum(run[0] for run in runs) / len(runs)
+        avg_expansions = sum(run[1] for run in runs) / len(runs)
+        found_rate = sum(run[2] for run in runs) / len(runs)
+        results.append([family, maze_size, len(runs), avg_exec_time, avg_expansions, found_rate])
+
+    with open('scenario_results.csv', 'w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Family", "Maze Size", "Queries", "Average Execution Time", "Average Expansions", "Found Rate"])
+        writer.writerows(results)
+
+
 def main():
     """
     Main function to start the A* application.
     Configures logging, initializes predefined settings, and starts the application.
     """
-    logging.basicConfig(filename='application.log', level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
+    setup_logging()
     logging.debug("Starting main.py")
+    from AstarApplication import AStarApplication
 
     predefined_settings = {
         'window_width': 600,
@@ -74,6 +113,7 @@ def main():
         'obstacle_color': '#000000',
         'background_color': '#ffffff',
         'expanded_node_color': '#808080',
+        'frontier_node_color': '#87CEEB',
         'maze': [
             [0, 0, 0, 1, 0, 0, 0, 0, 0, 0],
             [0, 1, 0, 1, 0, 1, 0, 1, 1, 0],
@@ -90,8 +130,8 @@ def main():
 
     bypass_settings = False
     astar_app = AStarApplication(bypass_settings=bypass_settings, predefined_settings=None)
+    logging.debug("Executing app event loop")
     sys.exit(astar_app.app.exec_())
 
 if __name__ == "__main__":
-    logging.debug("Executing app event loop")
     main()
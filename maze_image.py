@@ -0,0 +1,93 @@
+import numpy as np
+
+
+# Per-cell states of the indexed maze image; each value indexes the lookup table.
+CELL_FREE = 0
+CELL_OBSTACLE = 1
+CELL_EXPANDED = 2
+CELL_FRONTIER = 3
+CELL_PATH = 4
+CELL_START = 5
+CELL_GOAL = 6
+
+# Settings key and fallback color for each state, in state order.
+STATE_COLORS = [
+    ('background_color', '#FFFFFF'),
+    ('obstacle_color', '#000000'),
+    ('expanded_node_color', '#808080'),
+    ('frontier_node_color', '#87CEEB'),
+    ('path_color', '#0000FF'),
+    ('start_node_color', '#00FF00'),
+    ('end_node_color', '#FFD700'),
+]
+
+
+def build_state_image(maze):
+    """
+    Builds the one-byte-per-cell state image of a maze.
+
+    The image is indexed [column, row] because pyqtgraph treats the first axis as x.
+
+    Args:
+        maze (list): The maze matrix.
+
+    Returns:
+        np.ndarray: uint8 array of CELL_FREE and CELL_OBSTACLE values.
+    """
+    return (np.asarray(maze) != 0).astype(np.uint8).T.copy()
+
+
+def apply_events(image, events, endpoints=()):
+    """
+    Applies search deltas to a state image in place: closed cells become expanded
+    and opened or improved cells join the frontier. Later events win, and all
+    cells are written with a single array assignment.
+
+    Args:
+        image (np.ndarray): State image from build_state_image, indexed [column, row].
+        events (iterable): SearchEvents in the order they were emitted.
+        endpoints (tuple): Cells whose state is left untouched, e.g. start and goal.
+    """
+    updates = {}
+    for event in events:
+        for cell, _, _ in event.opened:
+            updates[cell] = CELL_FRONTIER
+        if event.closed is not None:
+            updates[event.closed] = CELL_EXPANDED
+    for cell in endpoints:
+        updates.pop(cell, None)
+    if updates:
+        rows, cols = zip(*updates)
+        image[list(cols), list(rows)] = list(updates.values())
+
+
+def hex_to_rgb(color):
+    """
+    Converts a '#RRGGBB' or '#RGB' color string to an RGB triple.
+
+    Args:
+        color (str): The color string.
+
+    Returns:
+        tuple: (red, green, blue) in 0-255.
+    """
+    value = color.lstrip('#')
+    if len(value) == 3:
+        value = ''.join(char * 2 for char in value)
+    return tuple(int(value[i:i + 2], 16) for i in (0, 2, 4))
+
+
+def build_lookup_table(settings, to_rgb=hex_to_rgb):
+    """
+    Builds the state-to-color lookup table from the color settings.
+
+    Args:
+        settings (dict): Settings containing the *_color keys.
+        to_rgb (function): Converts a color setting to an RGB triple. The default
+            only understands hex strings; the GUI passes a QColor-based converter
+            so color names keep working.
+
+    Returns:
+        np.ndarray: (number of states, 3) uint8 array of RGB colors.
+    """
+    return np.array([to_rgb(settings.get(key, default)) for key, default in STATE_COLORS], dtype=np.ubyte)
@@ -0,0 +1,87 @@
+import numpy as np
+from search import DIRECTIONS
+
+
+def compute_neighbor_masks(maze):
+    """
+    Computes the passable-neighbor mask of every cell in one vectorized pass.
+
+    Bit i of a cell's mask is set when DIRECTIONS[i] leads to an in-bounds free
+    cell. A cell's own state does not enter its mask.
+
+    Args:
+        maze (list): The maze matrix (lists, memoryview rows or a 2D array).
+
+    Returns:
+        np.ndarray: (rows, cols) uint8 array of masks.
+    """
+    grid = np.array(maze, dtype=np.uint8, ndmin=2)
+    rows, cols = grid.shape
+    # Pad with obstacles so out-of-bounds neighbors read as blocked.
+    free = np.zeros((rows + 2, cols + 2), dtype=np.uint8)
+    free[1:-1, 1:-1] = grid == 0
+    masks = np.zeros((rows, cols), dtype=np.uint8)
+    for bit, (dx, dy) in enumerate(DIRECTIONS):
+        masks |= free[1 + dx:1 + dx + rows, 1 + dy:1 + dy + cols] << bit
+    return masks
+
+
+class NeighborMasks:
+    """
+    Precomputed passable-neighbor masks for a maze, one byte per cell.
+
+    Rows are kept as bytearrays so the search can index them as masks[row][col]
+    without NumPy overhead, and so single-cell edits can be applied in place.
+    """
+
+    def __init__(self, maze):
+        """
+        Builds the masks for a maze.
+
+        Args:
+            maze (list): The maze matrix.
+        """
+        self.masks = [bytearray(row.tobytes()) for row in compute_neighbor_masks(maze)]
+        self.rows = len(self.masks)
+        self.cols = len(self.masks[0]) if self.masks else 0
+
+    def __getitem__(self, row):
+        return self.masks[row]
+
+    def set_cell(self, maze, cell, value):
+        """
+        Changes a maze cell and updates the masks of its neighbors locally.
+
+        Args:
+            maze (list): The maze matrix the masks were built from; modified in place.
+            cell (tuple): The cell to change.
+            value (int): 0 for free, 1 for obstacle.
+        """
+        row, col = cell
+        maze[row][col] = value
+        for bit, (dx, dy) in enumerate(DIRECTIONS):
+            # The neighbor that reaches this cell by moving in direction (dx, dy).
+            other_row, other_col = row - dx, col - dy
+            if 0 <= other_row < self.rows and 0 <= other_col < self.cols:
+                if value == 0:
+                    self.masks[other_row][other_col] |= 1 << bit
+                else:
+                    self.masks[other_row][other_col] &= ~(1 << bit) & 0xFF
+
+    def is_surrounded(self, cell):
+        """
+        Returns True if no neighbor of the cell is passable.
+        """
+        return self.masks[cell[0]][cell[1]] == 0
+
+    def is_dead_end(self, cell):
+        """
+        Returns True if the cell has exactly one passable neighbor.
+        """
+        return self.masks[cell[0]][cell[1]].bit_count() == 1
+
+    def to_array(self):
+        """
+        Returns the masks as a (rows, cols) uint8 array.
+        """
+        return np.frombuffer(b''.join(self.masks), dtype=np.uint8).reshape(self.rows, self.cols)
@@ -0,0 +1,221 @@
+import argparse
+import csv
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+
+
+DEFAULT_MIN_SIZE = 16
+DEFAULT_MAX_SIZE = 16384
+DEFAULT_DENSITY = 0.3
+DEFAULT_MAX_EXPANSIONS = 1000000
+DEFAULT_TIMEOUT = 1800
+FIELDS = [
+    'size', 'cells', 'status', 'maze_seconds', 'maze_bytes_per_cell',
+    'search_expansions', 'search_peak_bytes', 'search_bytes_per_cell', 'search_bytes_per_expansion',
+    'time_per_expansion_us', 'renderer_state_bytes_per_cell', 'renderer_frame_bytes_per_cell',
+    'renderer_peak_bytes_per_cell',
+    'rss_engine_bytes', 'rss_peak_bytes',
+]
+
+
+def current_rss():
+    """
+    Returns the resident set size of this process in bytes.
+    Reads /proc on Linux and falls back to the peak RSS elsewhere.
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return peak_rss()
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of this process in bytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def measure_size(size, density, max_expansions):
+    """
+    Measures the engine and the renderer on one maze size. Runs inside a worker
+    process so that RSS and failures are isolated per size.
+
+    Args:
+        size (int): The size of the maze (size x size).
+        density (float): Obstacle density.
+        max_expansions (int): Expansion cap for the corner-to-corner search.
+
+    Returns:
+        dict: One row of FIELDS.
+    """
+    import numpy as np
+    import search
+    from maze_image import build_state_image, build_lookup_table
+    from utils import generate_maze
+
+    cells = size * size
+    record = {'size': size, 'cells': cells}
+
+    # Engine: the maze as nested lists, then the A* bookkeeping on top of it.
+    tracemalloc.start()
+    start_time = time.perf_counter()
+    maze = generate_maze(size, density)
+    record['maze_seconds'] = time.perf_counter() - start_time
+    record['maze_bytes_per_cell'] = tracemalloc.get_traced_memory()[0] / cells
+    maze[0][0] = maze[size - 1][size - 1] = 0
+
+    tracemalloc.reset_peak()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = search.find_path(maze, (0, 0), (size - 1, size - 1), max_expansions=max_expansions)
+    search_peak = tracemalloc.get_traced_memory()[1] - baseline
+    tracemalloc.stop()
+    del result
+
+    # Time again untraced; tracemalloc slows every allocation down.
+    result = search.find_path(maze, (0, 0), (size - 1, size - 1), max_expansions=max_expansions)
+    expansions = max(1, result.stats['expansions'])
+    record['status'] = result.status
+    record['search_expansions'] = result.stats['expansions']
+    record['search_peak_bytes'] = search_peak
+    record['search_bytes_per_cell'] = search_peak / cells
+    record['search_bytes_per_expansion'] = search_peak / expansions
+    record['time_per_expansion_us'] = result.stats['elapsed'] / expansions * 1e6
+    record['rss_engine_bytes'] = current_rss()
+    del result
+
+    # Renderer: the Visualizer's indexed state image, and the RGBA frame pyqtgraph
+    # colors it into through the lookup table on every redraw.
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    state_image = build_state_image(maze)
+    lut = build_lookup_table({})
+    frame = np.empty(state_image.shape + (4,), dtype=np.ubyte)
+    frame[..., :3] = lut[state_image]
+    frame[..., 3] = 255
+    record['renderer_state_bytes_per_cell'] = state_image.nbytes / cells
+    record['renderer_frame_bytes_per_cell'] = frame.nbytes / cells
+    record['renderer_peak_bytes_per_cell'] = (tracemalloc.get_traced_memory()[1] - baseline) / cells
+    tracemalloc.stop()
+    record['rss_peak_bytes'] = peak_rss()
+    return record
+
+
+def run_size(size, density, max_expansions, timeout):
+    """
+    Runs measure_size in a fresh interpreter.
+
+    Returns:
+        dict: The measured row, or a row whose status describes the failure
+        (timeout, out of memory, crash).
+    """
+    command = [sys.executable, os.path.abspath(__file__), '--worker', str(size),
+               '--density', str(density), '--max-expansions', str(max_expansions)]
+    try:
+        completed = subprocess.run(command, capture_output=True, text=True, timeout=timeout,
+                                   cwd=os.path.dirname(os.path.abspath(__file__)))
+    except subprocess.TimeoutExpired:
+        return {'size': size, 'cells': size * size, 'status': f'timeout after {timeout}s'}
+    if completed.returncode != 0:
+        if completed.returncode < 0:
+            reason = 'killed (likely out of memory)'
+        else:
+            lines = completed.stderr.strip().splitlines()
+            reason = lines[-1] if lines else f'exit code {completed.returncode}'
+        return {'size': size, 'cells': size * size, 'status': f'failed: {reason}'}
+    return json.loads(completed.stdout)
+
+
+def plot_results(rows, filename):
+    """
+    Plots the growth curves of the engine and renderer on log-log axes.
+    Skipped with a note when matplotlib is not installed.
+    """
+    try:
+        import matplotlib
+    except ImportError:
+        print("matplotlib is not installed; skipping the plot")
+        return
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt
+
+    rows = [row for row in rows if 'search_peak_bytes' in row]
+    if not rows:
+        return
+    sizes = [row['size'] for row in rows]
+    figure, (memory_axis, time_axis) = plt.subplots(1, 2, figsize=(12, 5))
+    memory_axis.loglog(sizes, [row['maze_bytes_per_cell'] for row in rows], 'o-', label='Maze lists (bytes/cell)')
+    memory_axis.loglog(sizes, [row['search_bytes_per_expansion'] for row in rows], 's-', label='A* state (bytes/expansion)')
+    memory_axis.loglog(sizes, [row['renderer_state_bytes_per_cell'] for row in rows], '^-', label='State image (bytes/cell)')
+    memory_axis.loglog(sizes, [row['renderer_frame_bytes_per_cell'] for row in rows], 'd-', label='RGBA frame (bytes/cell)')
+    memory_axis.loglog(sizes, [row['renderer_peak_bytes_per_cell'] for row in rows], 'v--', label='Render peak (bytes/cell)')
+    memory_axis.loglog(sizes, [row['rss_peak_bytes'] / row['cells'] for row in rows], 'k:', label='Peak RSS (bytes/cell)')
+    memory_axis.set_xlabel('Maze size (cells per side)')
+    memory_axis.set_ylabel('Bytes')
+    memory_axis.legend()
+    time_axis.semilogx(sizes, [row['time_per_expansion_us'] for row in rows], 'o-')
+    time_axis.set_xlabel('Maze size (cells per side)')
+    time_axis.set_ylabel('Time per expanded node (us)')
+    figure.tight_layout()
+    figure.savefig(filename)
+
+
+def run_scaling_benchmark(min_size=DEFAULT_MIN_SIZE, max_size=DEFAULT_MAX_SIZE, density=DEFAULT_DENSITY,
+                          max_expansions=DEFAULT_MAX_EXPANSIONS, timeout=DEFAULT_TIMEOUT,
+                          results_file='scaling_results.csv', plot_file='scaling_results.png'):
+    """
+    Sweeps maze sizes by powers of two and records memory and time for each.
+    Writes the results to a CSV file and plots the growth curves.
+
+    Args:
+        min_size (int): Smallest maze size.
+        max_size (int): Largest maze size; the default reaches past 10k x 10k.
+        density (float): Obstacle density.
+        max_expansions (int): Expansion cap for each search.
+        timeout (float): Seconds allowed per size.
+        results_file (str): CSV output file.
+        plot_file (str): Plot output file, or None to skip plotting.
+
+    Returns:
+        list: One dict per size.
+    """
+    rows = []
+    size = min_size
+    while size <= max_size:
+        row = run_size(size, density, max_expansions, timeout)
+        rows.append(row)
+        print(f"{size:6d}: {row.get('status')}")
+        size *= 2
+
+    with open(results_file, 'w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(rows)
+    if plot_file:
+        plot_results(rows, plot_file)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Memory and time scaling benchmark across maze sizes.")
+    parser.add_argument('--min-size', type=int, default=DEFAULT_MIN_SIZE)
+    parser.add_argument('--max-size', type=int, default=DEFAULT_MAX_SIZE)
+    parser.add_argument('--density', type=float, default=DEFAULT_DENSITY)
+    parser.add_argument('--max-expansions', type=int, default=DEFAULT_MAX_EXPANSIONS)
+    parser.add_argument('--timeout', type=float, default=DEFAULT_TIMEOUT, help="Seconds allowed per size")
+    parser.add_argument('--no-plot', action='store_true', help="Skip the matplotlib plot")
+    parser.add_argument('--worker', type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker is not None:
+        print(json.dumps(measure_size(args.worker, args.density, args.max_expansions)))
+    else:
+        run_scaling_benchmark(args.min_size, args.max_size, args.density, args.max_expansions, args.timeout,
+                              plot_file=None if args.no_plot else 'scaling_results.png')
@@ -0,0 +1,348 @@
+import json
+import os
+import random
+import zlib
+from collections import namedtuple
+
+
+DEFAULT_CACHE_DIR = 'scenario_cache'
+DEFAULT_QUERIES = 10
+CACHE_MAGIC = b'ASCN'
+# Bump when a generator changes so stale cache files are regenerated.
+GENERATOR_VERSION = 1
+
+# A benchmark scenario: a maze from one family plus its start/goal queries.
+Scenario = namedtuple('Scenario', ['family', 'size', 'seed', 'maze', 'queries'])
+
+
+def _carve_grid(size):
+    """
+    Returns a maze that is all wall, used as the canvas for the perfect-maze generators.
+    Passage cells sit at odd coordinates; the cells between them are walls to knock down.
+    """
+    return [[1] * size for _ in range(size)]
+
+
+def backtracker_maze(size, rng):
+    """
+    Generates a perfect maze with an iterative recursive backtracker.
+
+    Args:
+        size (int): The size of the maze (size x size).
+        rng (random.Random): Seeded random generator.
+
+    Returns:
+        list: A 2D list with long, winding corridors and a single path between any two cells.
+    """
+    maze = _carve_grid(size)
+    cells = (size - 1) // 2
+    if cells == 0:
+        return [[0] * size for _ in range(size)]
+    visited = [[False] * cells for _ in range(cells)]
+    stack = [(0, 0)]
+    visited[0][0] = True
+    maze[1][1] = 0
+    while stack:
+        row, col = stack[-1]
+        options = [(row + dr, col + dc) for dr, dc in ((1, 0), (-1, 0), (0, 1), (0, -1))
+                   if 0 <= row + dr < cells and 0 <= col + dc < cells and not visited[row + dr][col + dc]]
+        if not options:
+            stack.pop()
+            continue
+        next_row, next_col = rng.choice(options)
+        visited[next_row][next_col] = True
+        maze[row + next_row + 1][col + next_col + 1] = 0
+        maze[2 * next_row + 1][2 * next_col + 1] = 0
+        stack.append((next_row, next_col))
+    return maze
+
+
+def kruskal_maze(size, rng):
+    """
+    Generates a perfect maze with randomized Kruskal's algorithm.
+
+    Args:
+        size (int): The size of the maze (size x size).
+        rng (random.Random): Seeded random generator.
+
+    Returns:
+        list: A 2D list with many short dead ends and a single path between any two cells.
+    """
+    maze = _carve_grid(size)
+    cells = (size - 1) // 2
+    if cells == 0:
+        return [[0] * size for _ in range(size)]
+    parent = list(range(cells * cells))
+
+    def find(index):
+        while parent[index] != index:
+            parent[index] = parent[parent[index]]
+            index = parent[index]
+        return index
+
+    for row in range(cells):
+        for col in range(cells):
+            maze[2 * row + 1][2 * col + 1] = 0
+    walls = [(row, col, row + dr, col + dc) for row in range(cells) for col in range(cells)
+             for dr, dc in ((1, 0), (0, 1)) if row + dr < cells and col + dc < cells]
+    rng.shuffle(walls)
+    for row, col, other_row, other_col in walls:
+        first, second = find(row * cells + col), find(other_row * cells + other_col)
+        if first != second:
+            parent[first] = second
+            maze[row + other_row + 1][col + other_col + 1] = 0
+    return maze
+
+
+def rooms_maze(size, rng, room_size=None):
+    """
+    Generates a grid of rooms separated by walls with one or two doors per wall segment.
+
+    Args:
+        size (int): The size of the maze (size x size).
+        rng (random.Random): Seeded random generator.
+        room_size (int): Distance between room walls, defaults to about an eighth of the size.
+
+    Returns:
+        list: A 2D list of rooms and doors.
+    """
+    room_size = room_size or max(4, size // 8)
+    maze = [[0] * size for _ in range(size)]
+    for line in range(room_size, size, room_size):
+        for index in range(size):
+            maze[line][index] = 1
+            maze[index][line] = 1
+    bounds = list(range(0, size, room_size)) + [size]
+    for line in range(room_size, size, room_size):
+        for low, high in zip(bounds, bounds[1:]):
+            segment = [index for index in range(low, high) if index % room_size != 0]
+            if not segment:
+                continue
+            for _ in range(rng.choice((1, 1, 2))):
+                door = rng.choice(segment)
+                maze[line][door] = 0
+                door = rng.choice(segment)
+                maze[door][line] = 0
+    return maze
+
+
+def open_field_maze(size, rng, wall_density=0.02, max_wall_length=None):
+    """
+    Generates a mostly empty field with sparse short wall segments.
+
+    Args:
+        size (int): The size of the maze (size x size).
+        rng (random.Random): Seeded random generator.
+        wall_density (float): Fraction of cells covered by walls (approximately).
+        max_wall_length (int): Longest wall segment, defaults to a tenth of the size.
+
+    Returns:
+        list: A 2D list with large open regions.
+    """
+    max_wall_length = max_wall_length or max(2, size // 10)
+    maze = [[0] * size for _ in range(size)]
+    remaining = int(size * size * wall_density)
+    while remaining > 0:
+        length = rng.randint(1, max_wall_length)
+        row, col = rng.randrange(size), rng.randrange(size)
+        horizontal = rng.random() < 0.5
+        for step in range(length):
+            r, c = (row, col + step) if horizontal else (row + step, col)
+            if r < size and c < size and maze[r][c] == 0:
+                maze[r][c] = 1
+                remaining -= 1
+    return maze
+
+
+def spiral_maze(size, rng):
+    """
+    Generates nested square walls whose gaps force a long spiral route to the center.
+
+    Args:
+        size (int): The size of the maze (size x size).
+        rng (random.Random): Seeded random generator, used to pick the gap side of each ring.
+
+    Returns:
+        list: A 2D list of concentric rings.
+    """
+    maze = [[0] * size for _ in range(size)]
+    for ring, offset in enumerate(range(1, size // 2, 2)):
+        low, high = offset, size - 1 - offset
+        if high - low < 2:
+            break
+        for index in range(low, high + 1):
+            maze[low][index] = maze[high][index] = 1
+            maze[index][low] = maze[index][high] = 1
+        # Rotate the gap from ring to ring so the route winds around the center.
+        side = (ring + rng.randrange(2) * 2) % 4
+        middle = low + rng.randrange(1, high - low)
+        gap = [(low, middle), (middle, high), (high, middle), (middle, low)][side]
+        maze[gap[0]][gap[1]] = 0
+    return maze
+
+
+FAMILIES = {
+    'backtracker': backtracker_maze,
+    'kruskal': kruskal_maze,
+    'rooms': rooms_maze,
+    'open_field': open_field_maze,
+    'spiral': spiral_maze,
+}
+
+
+def pick_queries(maze, rng, count):
+    """
+    Picks start/goal pairs of free cells; the first pair joins the first and last free
+    cells in row order, which sit near opposite corners.
+
+    Args:
+        maze (list): The maze matrix.
+        rng (random.Random): Seeded random generator.
+        count (int): Number of queries.
+
+    Returns:
+        list: (start, goal) pairs.
+    """
+    size = len(maze)
+    free = [(row, col) for row in range(size) for col in range(len(maze[0])) if maze[row][col] == 0]
+    if len(free) < 2:
+        return []
+    queries = [(free[0], free[-1])]
+    while len(queries) < count:
+        start, goal = rng.sample(free, 2)
+        queries.append((start, goal))
+    return queries[:count]
+
+
+def generate_scenario(family, size, seed, num_queries=DEFAULT_QUERIES):
+    """
+    Generates a scenario deterministically from its family, size and seed.
+
+    Args:
+        family (str): A key of FAMILIES.
+        size (int): The size of the maze (size x size).
+        seed (int): Random seed.
+        num_queries (int): Number of start/goal pairs.
+
+    Returns:
+        Scenario: The generated scenario.
+    """
+    rng = random.Random(f"{family}-{size}-{seed}")
+    maze = FAMILIES[family](size, rng)
+    return Scenario(family, size, seed, maze, pick_queries(maze, rng, num_queries))
+
+
+def pack_maze(maze):
+    """
+    Packs a maze into bytes at one bit per cell, row by row.
+    """
+    cols = len(maze[0])
+    row_bytes = (cols + 7) // 8
+    return b''.join(int(''.join('1' if cell else '0' for cell in row), 2).to_bytes(row_bytes, 'big')
+                    if cols else b'' for row in maze)
+
+
+def unpack_maze(data, rows, cols):
+    """
+    Inverse of pack_maze.
+    """
+    row_bytes = (cols + 7) // 8
+    maze = []
+    for row in range(rows):
+        bits = bin(int.from_bytes(data[row * row_bytes:(row + 1) * row_bytes], 'big'))[2:].zfill(cols)
+        maze.append([1 if bit == '1' else 0 for bit in bits[-cols:]])
+    return maze
+
+
+def save_scenario(scenario, path):
+    """
+    Writes a scenario to disk: a magic tag, a length-prefixed JSON header and the
+    zlib-compressed bit-packed maze.
+
+    Args:
+        scenario (Scenario): The scenario to save.
+        path (str): Destination file.
+    """
+    header = json.dumps({
+        'version': GENERATOR_VERSION,
+        'family': scenario.family,
+        'size': scenario.size,
+        'seed': scenario.seed,
+        'rows': len(scenario.maze),
+        'cols': len(scenario.maze[0]),
+        'queries': scenario.queries,
+    }).encode()
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as file:
+        file.write(CACHE_MAGIC)
+        file.write(len(header).to_bytes(4, 'big'))
+        file.write(header)
+        file.write(zlib.compress(pack_maze(scenario.maze), 6))
+    os.replace(temp_path, path)
+
+
+def read_scenario(path):
+    """
+    Reads a scenario written by save_scenario.
+
+    Args:
+        path (str): The cache file.
+
+    Returns:
+        Scenario: The scenario, or None if the file is from another generator version.
+    """
+    with open(path, 'rb') as file:
+        if file.read(4) != CACHE_MAGIC:
+            raise ValueError(f"Not a scenario file: {path}")
+        header = json.loads(file.read(int.from_bytes(file.read(4), 'big')))
+        if header['version'] != GENERATOR_VERSION:
+            return None
+        maze = unpack_maze(zlib.decompress(file.read()), header['rows'], header['cols'])
+    queries = [(tuple(start), tuple(goal)) for start, goal in header['queries']]
+    return Scenario(header['family'], header['size'], header['seed'], maze, queries)
+
+
+def load_scenario(family, size, seed, num_queries=DEFAULT_QUERIES, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Returns a scenario from the on-disk cache, generating and caching it on a miss.
+
+    Args:
+        family (str): A key of FAMILIES.
+        size (int): The size of the maze (size x size).
+        seed (int): Random seed.
+        num_queries (int): Number of start/goal pairs.
+        cache_dir (str): Cache directory, created if missing.
+
+    Returns:
+        Scenario: The scenario.
+    """
+    path = os.path.join(cache_dir, f"{family}_{size}_{seed}_{num_queries}.scn")
+    if os.path.exists(path):
+        scenario = read_scenario(path)
+        if scenario is not None:
+            return scenario
+    scenario = generate_scenario(family, size, seed, num_queries)
+    os.makedirs(cache_dir, exist_ok=True)
+    save_scenario(scenario, path)
+    return scenario
+
+
+def scenario_library(families=None, sizes=(64, 128, 256), seeds=(0,), num_queries=DEFAULT_QUERIES,
+                     cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Yields cached scenarios for every combination of family, size and seed.
+
+    Args:
+        families (list): Family names, defaults to all of FAMILIES.
+        sizes (iterable): Maze sizes.
+        seeds (iterable): Random seeds.
+        num_queries (int): Number of start/goal pairs per scenario.
+        cache_dir (str): Cache directory.
+
+    Yields:
+        Scenario: One scenario at a time, so large libraries are not held in memory.
+    """
+    for family in families or FAMILIES:
+        for size in sizes:
+            for seed in seeds:
+                yield load_scenario(family, size, seed, num_queries, cache_dir)
@@ -0,0 +1,495 @@
+import base64
+import heapq
+import threading
+import time
+from collections import namedtuple
+from compact_path import DIRECTIONS, CompactPath, reconstruct_compact_path
+
+
+DEFAULT_INITIAL_WEIGHT = 3.0
+DEFAULT_WEIGHT_STEP = 0.5
+LIMIT_CHECK_INTERVAL = 64
+
+# Passable-neighbor masks (see neighbor_mask.py): bit i is set when DIRECTIONS[i]
+# leads to an in-bounds free cell. These tables map a mask to its directions.
+MASK_INDICES = [[index for index in range(len(DIRECTIONS)) if mask >> index & 1] for mask in range(256)]
+MASK_DIRECTIONS = [[DIRECTIONS[index] for index in indices] for indices in MASK_INDICES]
+
+ENGINE_ASTAR = 'astar'
+ENGINE_WAVEFRONT = 'wavefront'
+ENGINE_FRONTIER = 'frontier'
+ENGINE_SYMMETRY = 'symmetry'
+ENGINES = (ENGINE_ASTAR, ENGINE_WAVEFRONT, ENGINE_FRONTIER, ENGINE_SYMMETRY)
+
+STATUS_FOUND = 'found'
+STATUS_UNREACHABLE = 'unreachable'
+STATUS_BUDGET_EXHAUSTED = 'budget_exhausted'
+STATUS_CANCELLED = 'cancelled'
+
+# Outcome of a search call. The path is a CompactPath. For anything but STATUS_FOUND
+# it leads to the expanded cell closest to the goal and the cost is the cost of that
+# partial path.
+SearchResult = namedtuple('SearchResult', ['status', 'path', 'cost', 'stats'])
+
+# Delta emitted by astar() for each expansion: the cell just closed and the cells
+# opened or improved by it as (cell, g, f). The final event carries the path and
+# status; closed is the goal when it was found and None otherwise.
+SearchEvent = namedtuple('SearchEvent', ['closed', 'opened', 'path', 'status'])
+
+# A solution reported by the anytime search: the path, its cost, the heuristic
+# weight it was found with and the proven suboptimality bound (1.0 = optimal).
+AnytimeSolution = namedtuple('AnytimeSolution', ['path', 'cost', 'weight', 'bound', 'elapsed'])
+
+
+def octile_distance(start, goal):
+    """
+    Calculates the octile distance between two points.
+
+    Args:
+        start (tuple): The start point.
+        goal (tuple): The goal point.
+
+    Returns:
+        float: The octile distance between the points.
+    """
+    dx = abs(start[0] - goal[0])
+    dy = abs(start[1] - goal[1])
+    return max(dx, dy) + (1 - 1 / 2) * min(dx, dy)
+
+
+def euclidean_distance(start, goal):
+    """
+    Calculates the Euclidean distance between two points.
+
+    Args:
+        start (tuple): The start point.
+        goal (tuple): The goal point.
+
+    Returns:
+        float: The Euclidean distance between the points.
+    """
+    dx = abs(start[0] - goal[0])
+    dy = abs(start[1] - goal[1])
+    return (dx**2 + dy**2)**0.5
+
+
+class CancelToken:
+    """
+    Cooperative cancellation flag shared between a search and its caller.
+    The search polls it periodically and stops with STATUS_CANCELLED once it is set.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        """
+        Requests cancellation of every search holding this token.
+        """
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+def deadline_after(seconds):
+    """
+    Converts a relative timeout into a deadline usable by the search functions.
+
+    Args:
+        seconds (float): Seconds from now, or None for no deadline.
+
+    Returns:
+        float: Deadline on the time.monotonic() clock, or None.
+    """
+    return None if seconds is None else time.monotonic() + seconds
+
+
+def check_cell(matrix, cell):
+    """
+    Converts a [row, col] pair to a tuple, checking it is a free cell of the maze.
+
+    Args:
+        matrix (list): The maze matrix.
+        cell (sequence): The cell to check.
+
+    Returns:
+        tuple: The cell.
+
+    Raises:
+        ValueError: If the cell is not two integers, lies outside the maze or is an obstacle.
+    """
+    cell = tuple(cell)
+    if len(cell) != 2 or not all(isinstance(value, int) and not isinstance(value, bool) for value in cell):
+        raise ValueError(f"cell must be [row, col] integers, got {list(cell)}")
+    rows, cols = len(matrix), len(matrix[0])
+    if not (0 <= cell[0] < rows and 0 <= cell[1] < cols):
+        raise ValueError(f"cell {list(cell)} is outside the {rows}x{cols} maze")
+    if matrix[cell[0]][cell[1]] != 0:
+        raise ValueError(f"cell {list(cell)} is an obstacle")
+    return cell
+
+
+def check_options(timeout=None, max_expansions=None, engine=ENGINE_ASTAR, max_nodes=None):
+    """
+    Checks per-query search options before a search is started.
+
+    Raises:
+        ValueError: If timeout is not a non-negative number, max_expansions or max_nodes
+            not a non-negative integer, or engine not one of ENGINES.
+    """
+    if timeout is not None and (isinstance(timeout, bool) or not isinstance(timeout, (int, float)) or timeout < 0):
+        raise ValueError(f"timeout must be a non-negative number of seconds, got {timeout!r}")
+    for name, value in (('max_expansions', max_expansions), ('max_nodes', max_nodes)):
+        if value is not None and (isinstance(value, bool) or not isinstance(value, int) or value < 0):
+            raise ValueError(f"{name} must be a non-negative integer, got {value!r}")
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown search engine: {engine}")
+
+
+def _limit_status(expansions, deadline, max_expansions, cancel_token):
+    """
+    Returns the status a search must stop with, or None if it may continue.
+    """
+    if cancel_token is not None and cancel_token.cancelled:
+        return STATUS_CANCELLED
+    if max_expansions is not None and expansions >= max_expansions:
+        return STATUS_BUDGET_EXHAUSTED
+    if deadline is not None and expansions % LIMIT_CHECK_INTERVAL == 0 and time.monotonic() >= deadline:
+        return STATUS_BUDGET_EXHAUSTED
+    return None
+
+
+def astar(matrix, start, goal, cost=octile_distance, heuristic=octile_distance,
+          deadline=None, max_expansions=None, cancel_token=None, neighbor_masks=None):
+    """
+    Implements the A* algorithm with optional work limits.
+
+    Args:
+        matrix (list): The maze matrix.
+        start (tuple): The start cell.
+        goal (tuple): The goal cell.
+        cost (function): Step cost between two adjacent cells.
+        heuristic (function): Estimate of the distance to the goal.
+        deadline (float): time.monotonic() value after which the search gives up.
+        max_expansions (int): Maximum number of cells to expand.
+        cancel_token (CancelToken): Token polled for cooperative cancellation.
+        neighbor_masks (NeighborMasks): Optional precomputed passable-neighbor masks,
+            indexable as [row][col]; the expansion then skips bounds and obstacle checks.
+
+    Yields:
+        SearchEvent: One delta per expanded cell, then a final event with the path.
+        Events never reference the search's live heap or dictionaries, so they can
+        be batched, serialized or handed to another thread while the search continues.
+
+    Returns:
+        SearchResult: The outcome, available as the StopIteration value.
+    """
+    started = time.perf_counter()
+    rows = len(matrix)
+    cols = len(matrix[0])
+    open_set = [(0, start)]
+    came_from = {}
+    g_score = {start: 0}
+    f_score = {start: heuristic(start, goal)}
+    best = start
+    best_h = heuristic(start, goal)
+    max_open = 1
+    expansions = 0
+    status = STATUS_UNREACHABLE
+
+    while open_set:
+        status = _limit_status(expansions, deadline, max_expansions, cancel_token)
+        if status is not None:
+            break
+        status = STATUS_UNREACHABLE
+        entry_f, current = heapq.heappop(open_set)
+        if entry_f > f_score[current]:
+            continue
+        expansions += 1
+
+        if current == goal:
+            best = goal
+            status = STATUS_FOUND
+            break
+        current_h = heuristic(current, goal)
+        if current_h < best_h:
+            best, best_h = current, current_h
+
+        opened = []
+        if neighbor_masks is None:
+            candidates = DIRECTIONS
+        else:
+            candidates = MASK_DIRECTIONS[neighbor_masks[current[0]][current[1]]]
+        for dx, dy in candidates:
+            neighbor = current[0] + dx, current[1] + dy
+            if neighbor_masks is None and not (0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols
+                                               and matrix[neighbor[0]][neighbor[1]] == 0):
+                continue
+            tentative_g_score = g_score[current] + cost(current, neighbor)
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
+                heapq.heappush(open_set, (f_score[neighbor], neighbor))
+                opened.append((neighbor, tentative_g_score, f_score[neighbor]))
+        max_open = max(max_open, len(open_set))
+        yield SearchEvent(current, opened, None, None)
+
+    stats = {
+        'expansions': expansions,
+        'generated': len(g_score),
+        'max_open': max_open,
+        'peak_nodes': len(g_score) + max_open,
+        'elapsed': time.perf_counter() - started,
+    }
+    result = SearchResult(status, reconstruct_compact_path(came_from, best, start), g_score[best], stats)
+    yield SearchEvent(goal if status == STATUS_FOUND else None, [], result.path, status)
+    return result
+
+
+def batch_events(events, size):
+    """
+    Groups search events into lists of up to size events.
+
+    Args:
+        events (iterable): SearchEvents, e.g. from astar().
+        size (int): Maximum events per batch.
+
+    Yields:
+        list: Consecutive events; the last batch ends with the final event.
+    """
+    batch = []
+    for event in events:
+        batch.append(event)
+        if len(batch) >= size or event.status is not None:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def encode_events(events):
+    """
+    Converts events into compact nested lists suitable for JSON or pickling.
+
+    Each event becomes [closed, opened, path, status] with cells as [row, col],
+    opened entries as [row, col, g, f] and the path as the base64 text of
+    CompactPath.to_bytes(), so a long path costs about two characters per three
+    steps instead of a cell list.
+
+    Args:
+        events (list): SearchEvents.
+
+    Returns:
+        list: The encoded events.
+    """
+    return [[list(event.closed) if event.closed is not None else None,
+             [[cell[0], cell[1], g, f] for cell, g, f in event.opened],
+             base64.b64encode(event.path.to_bytes()).decode('ascii') if event.path is not None else None,
+             event.status] for event in events]
+
+
+def decode_events(encoded):
+    """
+    Inverse of encode_events.
+
+    Args:
+        encoded (list): Events as produced by encode_events.
+
+    Returns:
+        list: SearchEvents.
+    """
+    return [SearchEvent(tuple(closed) if closed is not None else None,
+                        [((row, col), g, f) for row, col, g, f in opened],
+                        CompactPath.from_bytes(base64.b64decode(path)) if path is not None else None,
+                        status) for closed, opened, path, status in encoded]
+
+
+def run_search(steps):
+    """
+    Drives a search generator to completion without looking at its steps.
+
+    Args:
+        steps (generator): A generator such as the one returned by astar().
+
+    Returns:
+        SearchResult: The value the generator returned.
+    """
+    while True:
+        try:
+            next(steps)
+        except StopIteration as stop:
+            return stop.value
+
+
+def find_path(matrix, start, goal, cost=octile_distance, heuristic=octile_distance,
+              deadline=None, max_expansions=None, cancel_token=None, engine=ENGINE_ASTAR, max_nodes=None,
+              neighbor_masks=None, decomposition=None):
+    """
+    Runs a search headlessly and returns its structured result.
+
+    Args:
+        matrix (list): The maze matrix.
+        start (tuple): The start cell.
+        goal (tuple): The goal cell.
+        cost (function): Step cost between two adjacent cells.
+        heuristic (function): Estimate of the distance to the goal.
+        deadline (float): time.monotonic() value after which the search gives up.
+        max_expansions (int): Maximum number of cells to expand.
+        cancel_token (CancelToken): Token polled for cooperative cancellation.
+        engine (str): ENGINE_ASTAR, ENGINE_WAVEFRONT for the NumPy flood-fill backend,
+            ENGINE_FRONTIER for the memory-bounded search, or ENGINE_SYMMETRY for A*
+            with rectangular symmetry reduction.
+        max_nodes (int): Memory cap in stored cells, used by ENGINE_FRONTIER.
+        neighbor_masks (NeighborMasks): Optional precomputed passable-neighbor masks for
+            ENGINE_ASTAR, ENGINE_FRONTIER and ENGINE_SYMMETRY; the vectorized wavefront
+            does not need them.
+        decomposition (RectangleDecomposition): Optional precomputed rectangle decomposition
+            for ENGINE_SYMMETRY, built per call if omitted.
+
+    Returns:
+        SearchResult: Status, path (partial unless found), cost and stats.
+    """
+    if engine == ENGINE_WAVEFRONT:
+        # Imported lazily so the A* engine keeps working without NumPy.
+        import wavefront
+        return wavefront.wavefront_search(matrix, start, goal, cost, heuristic, deadline, max_expansions, cancel_token)
+    if engine == ENGINE_FRONTIER:
+        import frontier_search
+        return frontier_search.memory_bounded_search(matrix, start, goal, cost, heuristic, deadline,
+                                                     max_expansions, cancel_token, max_nodes, neighbor_masks)
+    if engine == ENGINE_SYMMETRY:
+        import symmetry
+        return symmetry.symmetry_search(matrix, start, goal, cost, heuristic, deadline, max_expansions, cancel_token,
+                                        decomposition, neighbor_masks)
+    if engine != ENGINE_ASTAR:
+        raise ValueError(f"Unknown search engine: {engine}")
+    return run_search(astar(matrix, start, goal, cost, heuristic, deadline, max_expansions, cancel_token,
+                            neighbor_masks))
+
+
+def anytime_astar(matrix, start, goal, cost=octile_distance, heuristic=octile_distance,
+                  initial_weight=DEFAULT_INITIAL_WEIGHT, weight_step=DEFAULT_WEIGHT_STEP, time_budget=None,
+                  cancel_token=None, neighbor_masks=None):
+    """
+    Anytime Repairing A* (ARA*) over the maze.
+
+    Runs a weighted A* with an inflated heuristic to get a first path quickly, then
+    lowers the weight and repairs the search, reusing everything expanded so far.
+    Each improved path is yielded as soon as it is found, together with the
+    suboptimality bound that is proven for it.
+
+    Args:
+        matrix (list): The maze matrix.
+        start (tuple): The start cell.
+        goal (tuple): The goal cell.
+        cost (function): Step cost between two adjacent cells.
+        heuristic (function): Admissible estimate of the distance to the goal.
+        initial_weight (float): Heuristic weight for the first search (>= 1).
+        weight_step (float): Amount the weight is lowered after each improvement.
+        time_budget (float): Seconds allowed for the whole search, or None for no limit.
+        cancel_token (CancelToken): Token polled for cooperative cancellation.
+        neighbor_masks (NeighborMasks): Optional precomputed passable-neighbor masks.
+
+    Yields:
+        AnytimeSolution: Each solution that lowers the cost or tightens the proven
+        bound. The last one has bound 1.0 when optimality was proven before the
+        time budget ran out.
+
+    Returns:
+        str: Final status, as the StopIteration value: STATUS_FOUND once optimality
+        is proven, STATUS_UNREACHABLE, STATUS_BUDGET_EXHAUSTED when the time budget
+        ran out (with or without a solution) or STATUS_CANCELLED.
+    """
+    started = time.perf_counter()
+    deadline = None if time_budget is None else started + time_budget
+    rows = len(matrix)
+    cols = len(matrix[0])
+    weight = max(1.0, initial_weight)
+
+    g_score = {start: 0}
+    came_from = {}
+    open_keys = {start: weight * heuristic(start, goal)}
+    open_set = [(open_keys[start], start)]
+    closed = set()
+    incons = set()
+    best_cost = None
+    best_bound = None
+    expansions = 0
+
+    def min_lower_bound():
+        nodes = list(open_keys) + list(incons)
+        if not nodes:
+            return None
+        return min(g_score[node] + heuristic(node, goal) for node in nodes)
+
+    while True:
+        # ImprovePath: expand until no open node can beat the incumbent at this weight.
+        while open_set:
+            key, current = open_set[0]
+            if open_keys.get(current) != key:
+                heapq.heappop(open_set)
+                continue
+            if goal in g_score and g_score[goal] <= key:
+                break
+            heapq.heappop(open_set)
+            del open_keys[current]
+            closed.add(current)
+            expansions += 1
+            if cancel_token is not None and cancel_token.cancelled:
+                return STATUS_CANCELLED
+            if deadline is not None and expansions % LIMIT_CHECK_INTERVAL == 0 and time.perf_counter() >= deadline:
+                return STATUS_BUDGET_EXHAUSTED
+
+            if neighbor_masks is None:
+                candidates = DIRECTIONS
+            else:
+                candidates = MASK_DIRECTIONS[neighbor_masks[current[0]][current[1]]]
+            for dx, dy in candidates:
+                neighbor = current[0] + dx, current[1] + dy
+                if neighbor_masks is None and (not (0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols)
+                                               or matrix[neighbor[0]][neighbor[1]] != 0):
+                    continue
+                tentative_g_score = g_score[current] + cost(current, neighbor)
+                if neighbor in g_score and tentative_g_score >= g_score[neighbor]:
+                    continue
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                if neighbor in closed:
+                    incons.add(neighbor)
+                else:
+                    open_keys[neighbor] = tentative_g_score + weight * heuristic(neighbor, goal)
+                    heapq.heappush(open_set, (open_keys[neighbor], neighbor))
+
+        if goal not in g_score:
+            return STATUS_UNREACHABLE
+
+        lower_bound = min_lower_bound()
+        if lower_bound is None or g_score[goal] <= lower_bound:
+            # Nothing still open can beat the incumbent, e.g. when start == goal.
+            bound = 1.0
+        elif lower_bound > 0:
+            bound = max(1.0, min(weight, g_score[goal] / lower_bound))
+        else:
+            bound = weight
+        if best_cost is None or g_score[goal] < best_cost or bound < best_bound:
+            best_cost, best_bound = g_score[goal], bound
+            yield AnytimeSolution(reconstruct_compact_path(came_from, goal, start), best_cost, weight, bound,
+                                  time.perf_counter() - started)
+        if bound == 1.0:
+            return STATUS_FOUND
+        if deadline is not None and time.perf_counter() >= deadline:
+            return STATUS_BUDGET_EXHAUSTED
+
+        # Lower the weight and move the inconsistent nodes back into the open set.
+        weight = max(1.0, weight - weight_step)
+        for node in incons:
+            open_keys[node] = None
+        incons.clear()
+        closed.clear()
+        for node in open_keys:
+            open_keys[node] = g_score[node] + weight * heuristic(node, goal)
+        open_set = [(key, node) for node, key in open_keys.items()]
+        heapq.heapify(open_set)
@@ -0,0 +1,506 @@
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import socket
+import statistics
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import batch
+import search
+from utils import setup_logging
+
+
+DEFAULT_SOCKET_PATH = '/tmp/astar.sock'
+DEFAULT_BATCH_WINDOW = 0.002
+DEFAULT_MAX_BATCH = 64
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024
+LATENCY_WINDOW = 1024
+QUERY_OPTIONS = ('timeout', 'max_expansions', 'engine', 'max_nodes')
+
+
+class ServerError(Exception):
+    """
+    Raised by PathClient when the server answers a request with an error.
+    """
+
+
+def result_to_dict(result):
+    """
+    Converts a SearchResult into a JSON-serializable dictionary.
+
+    Args:
+        result (SearchResult): The search result.
+
+    Returns:
+        dict: Status, path as [row, col] pairs, cost and stats.
+    """
+    return {
+        'status': result.status,
+        'path': result.path.tolist(),
+        'cost': result.cost,
+        'stats': result.stats,
+    }
+
+
+class MazeBatcher:
+    """
+    Groups queries for one resident maze that arrive close together and spreads
+    each group over the worker pool in one chunk per worker.
+    """
+
+    def __init__(self, shared_maze, pool, workers, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH,
+                 live_segments=None, on_release=None):
+        """
+        Initializes the batcher.
+
+        Args:
+            shared_maze (SharedMaze): The maze the queries run against.
+            pool (ProcessPoolExecutor): Worker pool running the searches.
+            workers (int): Number of worker processes in the pool.
+            batch_window (float): Seconds to wait for more queries before dispatching a group.
+            max_batch (int): Group size that is dispatched immediately.
+            live_segments (function): Returns the segment names workers should keep
+                attached; workers release the others before each task.
+            on_release (function): Called after the shared maze is released.
+        """
+        self.shared_maze = shared_maze
+        self.pool = pool
+        self.workers = workers
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.pending = []
+        self.flush_handle = None
+        self.in_flight = 0
+        self.retired = False
+        self.released = False
+        self.live_segments = live_segments
+        self.on_release = on_release
+
+    def submit(self, start, goal, options):
+        """
+        Queues a query for the next group.
+
+        Args:
+            start (tuple): The start cell.
+            goal (tuple): The goal cell.
+            options (dict): Per-query search limits.
+
+        Returns:
+            asyncio.Future: Resolves to (SearchResult, seconds spent waiting for dispatch).
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((start, goal, options, future, time.perf_counter()))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.batch_window, self.flush)
+        return future
+
+    def flush(self):
+        """
+        Dispatches every queued query, split into one worker task per chunk so the
+        group runs in parallel. Each task attaches to the shared maze once.
+        """
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        dispatched = time.perf_counter()
+        chunksize = -(-len(pending) // self.workers)
+        logging.debug(f"Dispatching {len(pending)} queries for maze {self.shared_maze.descriptor[0]} "
+                      f"in chunks of {chunksize}")
+        loop = asyncio.get_running_loop()
+        live = None if self.live_segments is None else sorted(self.live_segments())
+        for offset in range(0, len(pending), chunksize):
+            chunk = pending[offset:offset + chunksize]
+            task = loop.run_in_executor(self.pool, batch.solve_queries, self.shared_maze.descriptor,
+                                        [(start, goal, options) for start, goal, options, _, _ in chunk], live)
+            self.in_flight += 1
+            task.add_done_callback(lambda done, chunk=chunk: self.deliver(done, chunk, dispatched))
+
+    def deliver(self, done, pending, dispatched):
+        """
+        Hands the results of a finished chunk back to the waiting requests. A query
+        that failed only fails its own request; a lost worker fails the whole chunk.
+        """
+        self.in_flight -= 1
+        error = done.exception()
+        outcomes = [error] * len(pending) if error is not None else done.result()
+        for (_, _, _, future, queued), outcome in zip(pending, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result((outcome, dispatched - queued))
+        if self.retired and self.in_flight == 0:
+            self.release()
+
+    def retire(self):
+        """
+        Dispatches the queued queries and releases the shared maze once every
+        dispatched chunk has finished, so no worker loses the segment mid-search.
+        """
+        self.flush()
+        self.retired = True
+        if self.in_flight == 0:
+            self.release()
+
+    def release(self):
+        """
+        Releases the shared maze; safe to call more than once.
+        """
+        if not self.released:
+            self.released = True
+            self.shared_maze.close()
+            if self.on_release is not None:
+                self.on_release()
+
+
+class PathServer:
+    """
+    Keeps mazes resident in shared memory by ID and answers path queries on them.
+
+    Requests and responses are single-line JSON objects. Supported operations:
+    load (maze_id, maze), unload (maze_id), query (maze_id plus start/goal or a
+    list of queries, optional timeout, max_expansions, engine and max_nodes)
+    and stats.
+    """
+
+    def __init__(self, processes=None, batch_window=DEFAULT_BATCH_WINDOW, max_batch=DEFAULT_MAX_BATCH):
+        """
+        Initializes the server state and its worker pool.
+
+        Args:
+            processes (int): Number of worker processes, defaults to the CPU count.
+            batch_window (float): Seconds to wait for more queries on the same maze.
+            max_batch (int): Group size that is dispatched immediately.
+        """
+        self.processes = processes or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(self.processes)
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.mazes = {}
+        # Unloaded mazes whose last queries are still running.
+        self.retired = set()
+        self.latencies = deque(maxlen=LATENCY_WINDOW)
+        self.request_count = 0
+        self.closing = False
+
+    async def handle_client(self, reader, writer):
+        """
+        Serves one connection. Requests on a connection run concurrently and
+        their responses carry the request id.
+        """
+        logging.debug("Client connected")
+        write_lock = asyncio.Lock()
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self.respond(line, writer, write_lock))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        finally:
+            writer.close()
+            logging.debug("Client disconnected")
+
+    async def respond(self, line, writer, write_lock):
+        """
+        Handles one request line and writes its response.
+        """
+        request_id = None
+        try:
+            message = json.loads(line)
+            request_id = message.get('id')
+            response = await self.handle_request(message)
+            response['ok'] = True
+        except Exception as e:
+            logging.error(f"Request {request_id} failed: {e}")
+            response = {'ok': False, 'error': f"{type(e).__name__}: {e}"}
+        response['id'] = request_id
+        async with write_lock:
+            writer.write(json.dumps(response).encode() + b'\n')
+            await writer.drain()
+
+    async def handle_request(self, message):
+        """
+        Dispatches a decoded request to its operation.
+
+        Args:
+            message (dict): The request.
+
+        Returns:
+            dict: The response fields.
+        """
+        op = message.get('op')
+        if op == 'load':
+            return self.load_maze(message['maze_id'], message['maze'])
+        if op == 'unload':
+            return self.unload_maze(message['maze_id'])
+        if op == 'query':
+            return await self.query(message)
+        if op == 'stats':
+            return self.stats()
+        raise ValueError(f"Unknown operation: {op}")
+
+    def load_maze(self, maze_id, maze):
+        """
+        Makes a maze resident under the given ID, replacing any previous one.
+        """
+        if maze_id in self.mazes:
+            self.unload_maze(maze_id)
+        shared = batch.SharedMaze(maze)
+        self.mazes[maze_id] = MazeBatcher(shared, self.pool, self.processes, self.batch_window, self.max_batch,
+                                          self.live_segments, self.detach_workers)
+        logging.debug(f"Loaded maze {maze_id} ({shared.rows}x{shared.cols})")
+        return {'maze_id': maze_id, 'rows': shared.rows, 'cols': shared.cols}
+
+    def unload_maze(self, maze_id):
+        """
+        Releases a resident maze. Queries already accepted for it still complete;
+        its shared memory is freed when the last of them finishes.
+        """
+        batcher = self.mazes.pop(maze_id)
+        batcher.retire()
+        self.retired = {retired for retired in self.retired if not retired.released}
+        if not batcher.released:
+            self.retired.add(batcher)
+        logging.debug(f"Unloaded maze {maze_id}")
+        return {'maze_id': maze_id}
+
+    def live_segments(self):
+        """
+        Returns the segment names of resident mazes and of unloaded mazes whose
+        queries are still running.
+        """
+        batchers = list(self.mazes.values()) + [retired for retired in self.retired if not retired.released]
+        return {batcher.shared_maze.descriptor[0] for batcher in batchers}
+
+    def detach_workers(self):
+        """
+        Asks every worker to release the mazes that are no longer resident, so an
+        unloaded maze does not stay mapped in idle workers. Workers that miss this
+        do the same before their next task.
+        """
+        if self.closing:
+            return
+        live = sorted(self.live_segments())
+        for _ in range(self.processes):
+            self.pool.submit(batch.detach_stale_grids, live)
+
+    async def query(self, message):
+        """
+        Runs a single query or a list of queries against a resident maze.
+
+        Returns:
+            dict: Results in request order plus latency metrics in milliseconds.
+        """
+        received = time.perf_counter()
+        batcher = self.mazes[message['maze_id']]
+        defaults = {key: message[key] for key in QUERY_OPTIONS if key in message}
+        queries = message['queries'] if 'queries' in message else [message]
+        if not queries:
+            raise ValueError("queries must be a non-empty list")
+        checked = []
+        for query in queries:
+            options = dict(defaults)
+            options.update({key: query[key] for key in QUERY_OPTIONS if key in query})
+            # Checked here so a bad query fails only its own request, before it shares a worker task.
+            search.check_options(**options)
+            grid = batcher.shared_maze.grid
+            checked.append((search.check_cell(grid, query['start']), search.check_cell(grid, query['goal']), options))
+        futures = [batcher.submit(start, goal, options) for start, goal, options in checked]
+        answers = await asyncio.gather(*futures)
+        latency_ms = (time.perf_counter() - received) * 1000
+        self.latencies.append(latency_ms)
+        self.request_count += 1
+        return {
+            'results': [result_to_dict(result) for result, _ in answers],
+            'latency_ms': latency_ms,
+            'queue_ms': max(queued for _, queued in answers) * 1000,
+            'search_ms': sum(result.stats['elapsed'] for result, _ in answers) * 1000,
+        }
+
+    def stats(self):
+        """
+        Returns server-wide latency metrics over the most recent requests.
+        """
+        latencies = sorted(self.latencies)
+        summary = {'requests': self.request_count, 'mazes': sorted(self.mazes)}
+        if latencies:
+            summary.update({
+                'mean_ms': statistics.fmean(latencies),
+                'p50_ms': latencies[len(latencies) // 2],
+                'p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+                'max_ms': latencies[-1],
+            })
+        return summary
+
+    def close(self):
+        """
+        Releases every resident maze and stops the worker pool.
+        """
+        self.closing = True
+        for maze_id in list(self.mazes):
+            self.unload_maze(maze_id)
+        self.pool.shutdown()
+        # The pool has drained, but completion callbacks may not have run on the loop.
+        for batcher in self.retired:
+            batcher.release()
+        self.retired.clear()
+
+
+async def serve(path_server, socket_path=None, host=None, port=None):
+    """
+    Runs the server until cancelled, on a Unix socket or on a localhost TCP port.
+
+    Args:
+        path_server (PathServer): The server state.
+        socket_path (str): Unix socket path, used when host is None.
+        host (str): TCP host to bind, e.g. '127.0.0.1'.
+        port (int): TCP port to bind.
+    """
+    if host is not None:
+        listener = await asyncio.start_server(path_server.handle_client, host, port, limit=MAX_MESSAGE_BYTES)
+        logging.debug(f"Path server listening on {host}:{port}")
+    else:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        listener = await asyncio.start_unix_server(path_server.handle_client, socket_path, limit=MAX_MESSAGE_BYTES)
+        logging.debug(f"Path server listening on {socket_path}")
+    try:
+        async with listener:
+            await listener.serve_forever()
+    finally:
+        path_server.close()
+        if host is None and os.path.exists(socket_path):
+            os.unlink(socket_path)
+
+
+class PathClient:
+    """
+    Blocking client for PathServer, one outstanding request at a time.
+    """
+
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, host=None, port=None, timeout=None):
+        """
+        Connects to a running server.
+
+        Args:
+            socket_path (str): Unix socket path, used when host is None.
+            host (str): TCP host of the server.
+            port (int): TCP port of the server.
+            timeout (float): Socket timeout in seconds.
+        """
+        if host is not None:
+            self.sock = socket.create_connection((host, port), timeout)
+        else:
+            self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.sock.settimeout(timeout)
+            self.sock.connect(socket_path)
+        self.stream = self.sock.makefile('rwb')
+        self.next_id = 0
+
+    def request(self, op, **fields):
+        """
+        Sends a request and waits for its response.
+
+        Returns:
+            dict: The response.
+
+        Raises:
+            ServerError: If the server reports an error.
+        """
+        self.next_id += 1
+        message = dict(fields, op=op, id=self.next_id)
+        self.stream.write(json.dumps(message).encode() + b'\n')
+        self.stream.flush()
+        while True:
+            line = self.stream.readline()
+            if not line:
+                raise ConnectionError("Server closed the connection")
+            response = json.loads(line)
+            if response.get('id') == self.next_id:
+                break
+        if not response['ok']:
+            raise ServerError(response['error'])
+        return response
+
+    def load_maze(self, maze_id, maze):
+        return self.request('load', maze_id=maze_id, maze=maze)
+
+    def unload_maze(self, maze_id):
+        return self.request('unload', maze_id=maze_id)
+
+    def query(self, maze_id, start, goal, **options):
+        """
+        Runs one query and returns its result dictionary.
+        """
+        response = self.request('query', maze_id=maze_id, start=list(start), goal=list(goal), **options)
+        return response['results'][0]
+
+    def query_batch(self, maze_id, queries, **options):
+        """
+        Runs (start, goal) queries as one request.
+
+        Returns:
+            dict: The response, with 'results' in query order and latency metrics.
+        """
+        queries = [{'start': list(start), 'goal': list(goal)} for start, goal in queries]
+        return self.request('query', maze_id=maze_id, queries=queries, **options)
+
+    def stats(self):
+        return self.request('stats')
+
+    def close(self):
+        self.stream.close()
+        self.sock.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def main():
+    """
+    Command-line entry point: starts the path server.
+    """
+    parser = argparse.ArgumentParser(description="Local A* path query server.")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument('--host', help="Listen on this TCP host instead of a Unix socket")
+    parser.add_argument('--port', type=int, default=8765, help="TCP port used with --host")
+    parser.add_argument('--processes', type=int, help="Worker processes (default: CPU count)")
+    parser.add_argument('--batch-window', type=float, default=DEFAULT_BATCH_WINDOW, help="Seconds to group queries")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH, help="Largest query group")
+    args = parser.parse_args()
+    setup_logging()
+
+    path_server = PathServer(args.processes, args.batch_window, args.max_batch)
+
+    async def run():
+        # Treat SIGTERM like Ctrl+C so resident mazes are released from shared memory.
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+        await serve(path_server, args.socket, args.host, args.port if args.host else None)
+
+    try:
+        asyncio.run(run())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logging.debug("Path server stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+import argparse
+import csv
+import datetime
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+HEAVY_MODULES = ('PyQt5', 'pyqtgraph', 'pandas', 'matplotlib')
+SCENARIOS = {
+    'interpreter': ['-c', 'pass'],
+    'import_search': ['-c', 'import search'],
+    'headless_query': ['-c', 'import search; search.find_path([[0] * 16] * 16, (0, 0), (15, 15))'],
+}
+
+
+def time_command(args, repeats, stdin_data=None):
+    """
+    Runs a fresh interpreter several times and measures its wall-clock time.
+
+    Args:
+        args (list): Arguments passed to the Python interpreter.
+        repeats (int): Number of runs.
+        stdin_data (bytes): Data fed to the process's standard input.
+
+    Returns:
+        list: Duration of each run in milliseconds.
+    """
+    durations = []
+    for _ in range(repeats):
+        start_time = time.perf_counter()
+        subprocess.run([sys.executable] + args, cwd=HERE, input=stdin_data, stdout=subprocess.DEVNULL, check=True)
+        durations.append((time.perf_counter() - start_time) * 1000)
+    return durations
+
+
+def loaded_heavy_modules(statement):
+    """
+    Returns which GUI or export packages a statement pulls in.
+
+    Args:
+        statement (str): Python code to run in a fresh interpreter.
+
+    Returns:
+        list: Names from HEAVY_MODULES found in sys.modules afterwards.
+    """
+    probe = f"{statement}\nimport sys\nprint(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    output = subprocess.run([sys.executable, '-c', probe], cwd=HERE, capture_output=True, text=True, check=True)
+    return [name for name in output.stdout.strip().split(',') if name]
+
+
+def run_startup_benchmark(repeats=20, results_file='startup_results.csv'):
+    """
+    Measures cold-start time for headless use and appends it to a CSV file,
+    so the numbers can be tracked from run to run.
+
+    Args:
+        repeats (int): Runs per scenario.
+        results_file (str): CSV file the results are appended to.
+
+    Returns:
+        list: Rows of [timestamp, scenario, min ms, median ms].
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        maze_file = os.path.join(tmp, 'maze.json')
+        with open(maze_file, 'w') as file:
+            json.dump([[0] * 16] * 16, file)
+        scenarios = dict(SCENARIOS)
+        scenarios['cli_query'] = ['cli.py', maze_file]
+        query = json.dumps({'start': [0, 0], 'goal': [15, 15]}).encode() + b'\n'
+
+        timestamp = datetime.datetime.now().isoformat(timespec='seconds')
+        rows = []
+        for name, args in scenarios.items():
+            durations = time_command(args, repeats, query if name == 'cli_query' else None)
+            rows.append([timestamp, name, round(min(durations), 2), round(statistics.median(durations), 2)])
+            print(f"{name:16s} min {min(durations):7.2f} ms   median {statistics.median(durations):7.2f} ms")
+
+    heavy = loaded_heavy_modules('import search, batch, cli, server')
+    if heavy:
+        print(f"WARNING: headless modules import {', '.join(heavy)}")
+
+    write_header = not os.path.exists(results_file)
+    with open(results_file, 'a', newline='') as file:
+        writer = csv.writer(file)
+        if write_header:
+            writer.writerow(["Timestamp", "Scenario", "Min (ms)", "Median (ms)"])
+        writer.writerows(rows)
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark cold-start time of headless path queries.")
+    parser.add_argument('--repeats', type=int, default=20, help="Runs per scenario")
+    parser.add_argument('--output', default='startup_results.csv', help="CSV file results are appended to")
+    args = parser.parse_args()
+    run_startup_benchmark(args.repeats, args.output)
@@ -0,0 +1,282 @@
+import heapq
+import time
+from array import array
+import search
+from compact_path import CompactPath
+from utils import reconstruct_path
+
+
+# Rectangles thinner than this have no interior cells to skip.
+MIN_RECTANGLE_SIDE = 3
+
+
+class RectangleDecomposition:
+    """
+    Free space of a maze split greedily into empty rectangles.
+
+    Only rectangles with an interior (at least MIN_RECTANGLE_SIDE cells on each
+    side) are kept; every other free cell stays a plain grid cell. Inside an empty
+    rectangle all routes between two perimeter cells of the same length are
+    symmetric, so the search can skip the interior and jump between perimeter
+    cells with macro edges instead.
+    """
+
+    def __init__(self, matrix):
+        """
+        Decomposes the free space of a maze.
+
+        Args:
+            matrix (list): The maze matrix.
+        """
+        self.rows = len(matrix)
+        self.cols = len(matrix[0])
+        # (top, left, bottom, right), inclusive.
+        self.rectangles = []
+        # Rectangle index of each cell in row-major order, -1 for obstacles and plain
+        # cells; four bytes per cell, since every worker keeps its own copy.
+        self.owner = array('i', [-1]) * (self.rows * self.cols)
+        taken = [bytearray(cell != 0 for cell in matrix[row]) for row in range(self.rows)]
+        for row in range(self.rows):
+            for col in range(self.cols):
+                if taken[row][col]:
+                    continue
+                if not self._fits_minimum(taken, row, col):
+                    # Growth would stop below MIN_RECTANGLE_SIDE, so skip it; on corridor
+                    # mazes re-growing along every corridor cell made this cubic.
+                    taken[row][col] = 1
+                    continue
+                bottom, right = self._grow(taken, row, col)
+                index = len(self.rectangles)
+                self.rectangles.append((row, col, bottom, right))
+                width = right - col + 1
+                for r in range(row, bottom + 1):
+                    taken[r][col:right + 1] = b'\x01' * width
+                    self.owner[r * self.cols + col:r * self.cols + right + 1] = array('i', [index]) * width
+
+    def _fits_minimum(self, taken, top, left):
+        """
+        Returns True if the MIN_RECTANGLE_SIDE square anchored at (top, left) is free.
+        _grow reaches that size exactly when this square is free.
+        """
+        if top + MIN_RECTANGLE_SIDE > self.rows or left + MIN_RECTANGLE_SIDE > self.cols:
+            return False
+        return not any(any(taken[r][left:left + MIN_RECTANGLE_SIDE]) for r in range(top, top + MIN_RECTANGLE_SIDE))
+
+    def _grow(self, taken, top, left):
+        """
+        Returns the bottom-right corner of a maximal empty rectangle anchored at (top, left).
+        Grows as a square first so open areas are not cut into thin strips.
+        """
+        bottom, right = top, left
+        while (bottom + 1 < self.rows and right + 1 < self.cols
+               and not any(taken[bottom + 1][left:right + 2])
+               and not any(taken[r][right + 1] for r in range(top, bottom + 1))):
+            bottom += 1
+            right += 1
+        while right + 1 < self.cols and not any(taken[r][right + 1] for r in range(top, bottom + 1)):
+            right += 1
+        while bottom + 1 < self.rows and not any(taken[bottom + 1][left:right + 1]):
+            bottom += 1
+        return bottom, right
+
+    def is_interior(self, cell):
+        """
+        Returns True if the cell lies strictly inside one of the rectangles.
+        """
+        index = self.owner[cell[0] * self.cols + cell[1]]
+        if index < 0:
+            return False
+        top, left, bottom, right = self.rectangles[index]
+        return top < cell[0] < bottom and left < cell[1] < right
+
+    def interior_cells(self):
+        """
+        Returns the number of cells the search never has to generate.
+        """
+        return sum((bottom - top - 1) * (right - left - 1) for top, left, bottom, right in self.rectangles)
+
+    def perimeter(self, index):
+        """
+        Returns the perimeter cells of a rectangle.
+        """
+        top, left, bottom, right = self.rectangles[index]
+        cells = [(top, col) for col in range(left, right + 1)] + [(bottom, col) for col in range(left, right + 1)]
+        cells += [(row, left) for row in range(top + 1, bottom)] + [(row, right) for row in range(top + 1, bottom)]
+        return cells
+
+    def macro_successors(self, cell, index):
+        """
+        Returns the cells a perimeter cell jumps to across its rectangle.
+
+        For each side the cell lies on, these are the cells of the opposite side
+        within diagonal reach, plus the ends of the two inward diagonals. Together
+        with ordinary moves along the perimeter they reach every perimeter cell at
+        its free-space distance, which keeps the search optimal.
+
+        Args:
+            cell (tuple): A perimeter cell.
+            index (int): The index of its rectangle.
+
+        Returns:
+            list: Perimeter cells of the same rectangle.
+        """
+        top, left, bottom, right = self.rectangles[index]
+        row, col = cell
+        successors = []
+        # (on this side, depth across, lateral position, lateral range, cell builder)
+        sides = (
+            (row == top, bottom - top, col, left, right, lambda depth, lateral: (top + depth, lateral)),
+            (row == bottom, bottom - top, col, left, right, lambda depth, lateral: (bottom - depth, lateral)),
+            (col == left, right - left, row, top, bottom, lambda depth, lateral: (lateral, left + depth)),
+            (col == right, right - left, row, top, bottom, lambda depth, lateral: (lateral, right - depth)),
+        )
+        for on_side, depth, lateral, low, high, make in sides:
+            if not on_side:
+                continue
+            for other in range(max(low, lateral - depth), min(high, lateral + depth) + 1):
+                successors.append(make(depth, other))
+            # Inward diagonals that hit a neighboring side before the opposite one.
+            if 0 < lateral - low < depth:
+                successors.append(make(lateral - low, low))
+            if 0 < high - lateral < depth:
+                successors.append(make(high - lateral, high))
+        return successors
+
+
+def expand_path(waypoints):
+    """
+    Replaces macro edges in a path with the cells they cross, diagonal moves first.
+
+    Args:
+        waypoints (list): Cells where consecutive cells may be several steps apart
+            inside an empty rectangle.
+
+    Returns:
+        list: A path of adjacent cells.
+    """
+    path = waypoints[:1]
+    for target in waypoints[1:]:
+        row, col = path[-1]
+        while (row, col) != target:
+            row += (target[0] > row) - (target[0] < row)
+            col += (target[1] > col) - (target[1] < col)
+            path.append((row, col))
+    return path
+
+
+def symmetry_search(matrix, start, goal, cost=search.octile_distance, heuristic=search.octile_distance,
+                    deadline=None, max_expansions=None, cancel_token=None, decomposition=None, neighbor_masks=None):
+    """
+    A* with rectangular symmetry reduction.
+
+    Interior cells of empty rectangles are never generated; perimeter cells
+    instead get macro edges across their rectangle at free-space cost. A start
+    inside a rectangle connects to that rectangle's whole perimeter, and a goal
+    inside one is reachable from all of its perimeter. Paths are optimal, as
+    short as plain A* finds, when the heuristic is admissible for the step cost:
+    octile with the default cost, euclidean_distance with Euclidean steps. The
+    octile heuristic overestimates Euclidean diagonals, and with that pairing
+    neither engine is guaranteed optimal.
+
+    Args:
+        matrix (list): The maze matrix.
+        start (tuple): The start cell.
+        goal (tuple): The goal cell.
+        cost (function): Step cost between two adjacent cells.
+        heuristic (function): Admissible estimate of the distance to the goal.
+        deadline (float): time.monotonic() value after which the search gives up.
+        max_expansions (int): Maximum number of cells to expand.
+        cancel_token (CancelToken): Token polled for cooperative cancellation.
+        decomposition (RectangleDecomposition): Precomputed decomposition of the maze,
+            built for this call if omitted. Callers running many queries on one
+            maze should build it once and pass it in.
+        neighbor_masks (NeighborMasks): Optional precomputed passable-neighbor masks.
+
+    Returns:
+        SearchResult: Status, path (partial unless found), cost and stats. Stats
+        also report the number of rectangles and of skipped interior cells.
+    """
+    started = time.perf_counter()
+    if decomposition is None:
+        decomposition = RectangleDecomposition(matrix)
+    rows, cols = decomposition.rows, decomposition.cols
+    owner = decomposition.owner
+    straight_cost = cost((0, 0), (1, 0))
+    diagonal_cost = cost((0, 0), (1, 1))
+    goal_rectangle = owner[goal[0] * cols + goal[1]] if decomposition.is_interior(goal) else -1
+
+    def macro_cost(a, b):
+        dx, dy = abs(a[0] - b[0]), abs(a[1] - b[1])
+        return min(dx, dy) * diagonal_cost + abs(dx - dy) * straight_cost
+
+    open_set = [(heuristic(start, goal), start)]
+    came_from = {}
+    g_score = {start: 0}
+    f_score = {start: heuristic(start, goal)}
+    best = start
+    best_h = heuristic(start, goal)
+    max_open = 1
+    expansions = 0
+    status = search.STATUS_UNREACHABLE
+
+    while open_set:
+        status = search._limit_status(expansions, deadline, max_expansions, cancel_token)
+        if status is not None:
+            break
+        status = search.STATUS_UNREACHABLE
+        entry_f, current = heapq.heappop(open_set)
+        if entry_f > f_score[current]:
+            continue
+        expansions += 1
+
+        if current == goal:
+            best = goal
+            status = search.STATUS_FOUND
+            break
+        current_h = heuristic(current, goal)
+        if current_h < best_h:
+            best, best_h = current, current_h
+
+        successors = []
+        index = owner[current[0] * cols + current[1]]
+        if decomposition.is_interior(current):
+            # Only the start can be an interior cell.
+            successors = [(cell, macro_cost(current, cell)) for cell in decomposition.perimeter(index)]
+        else:
+            if neighbor_masks is None:
+                candidates = search.DIRECTIONS
+            else:
+                candidates = search.MASK_DIRECTIONS[neighbor_masks[current[0]][current[1]]]
+            for dx, dy in candidates:
+                neighbor = current[0] + dx, current[1] + dy
+                if neighbor_masks is None and not (0 <= neighbor[0] < rows and 0 <= neighbor[1] < cols
+                                                   and matrix[neighbor[0]][neighbor[1]] == 0):
+                    continue
+                if neighbor == goal or not decomposition.is_interior(neighbor):
+                    successors.append((neighbor, cost(current, neighbor)))
+            if index >= 0:
+                successors += [(cell, macro_cost(current, cell))
+                               for cell in decomposition.macro_successors(current, index)]
+        if index >= 0 and index == goal_rectangle:
+            successors.append((goal, macro_cost(current, goal)))
+
+        for neighbor, step_cost in successors:
+            tentative_g_score = g_score[current] + step_cost
+            if neighbor not in g_score or tentative_g_score < g_score[neighbor]:
+                came_from[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                f_score[neighbor] = tentative_g_score + heuristic(neighbor, goal)
+                heapq.heappush(open_set, (f_score[neighbor], neighbor))
+        max_open = max(max_open, len(open_set))
+
+    stats = {
+        'expansions': expansions,
+        'generated': len(g_score),
+        'max_open': max_open,
+        'peak_nodes': len(g_score) + max_open,
+        'rectangles': len(decomposition.rectangles),
+        'skipped_cells': decomposition.interior_cells(),
+        'elapsed': time.perf_counter() - started,
+    }
+    path = CompactPath.from_cells(expand_path(reconstruct_path(came_from, best, start)))
+    return search.SearchResult(status, path, g_score[best], stats)
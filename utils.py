@@ -1,12 +1,14 @@
 import random
 import logging
 import datetime
+import json
 
 
 def setup_logging():
     """
     Configure the logging settings for the application.
-    Logs will be written to 'application.log' with a specific format.
+    Logs will be written to a timestamped '<time>_application.log' with a specific format.
+    Entry points call this explicitly; importing modules never configures logging.
     """
     current_time = datetime.datetime.now().strftime("%Y-%m-%d_%I-%M-%S_%p")
     filename = f'{current_time}_application.log'
@@ -53,5 +55,27 @@ def generate_maze(size, obstacle_density):
     return maze
 
 
-# Call setup_logging to configure logging when this module is imported
-setup_logging()
+def load_maze(path):
+    """
+    Loads a maze from a file.
+    
+    The file is either a JSON list of rows, or plain text with one row per line
+    where '1' or '#' marks an obstacle and '0' or '.' a free cell.
+    
+    Args:
+        path (str): Path to the maze file.
+    
+    Returns:
+        list: A 2D list representing the maze.
+    """
+    with open(path) as file:
+        text = file.read()
+    if text.lstrip().startswith('['):
+        return json.loads(text)
+    maze = []
+    for line in text.splitlines():
+        line = line.strip()
+        if line:
+            maze.append([1 if char in '1#' else 0 for char in line if char in '01#.'])
+    return maze
+